@@ -0,0 +1 @@
+"""Offline micro-benchmarks for the bot's CPU-side hot paths."""
@@ -0,0 +1,107 @@
+"""Benchmark cases. Each ``prepare`` builds its fixture up front and returns the timed callable."""
+import importlib
+import os
+import tempfile
+from dataclasses import dataclass
+from types import SimpleNamespace
+from typing import Callable, Tuple
+
+from benchmarks import fixtures
+
+
+@dataclass(frozen=True)
+class Benchmark:
+    name: str
+    unit: str
+    prepare: Callable[[float], Tuple[Callable[[], object], int]]
+
+
+def _bare(module: str, cls: str):
+    """Instantiate a cog without running __init__, so no bot, tasks or network are needed."""
+    mod = importlib.import_module(module)
+    klass = getattr(mod, cls)
+    return mod, klass.__new__(klass)
+
+
+def _extract_changes(scale: float):
+    _, cog = _bare("bot.features.auto_pr_review.cog", "AutoPRReviewCog")
+    files, per_file = 40, int(2500 * scale)
+    diff = fixtures.unified_diff(files, per_file)
+    return (lambda: cog.extract_changes(diff)), files * per_file
+
+
+def _filter_lines(scale: float):
+    _, cog = _bare("bot.features.auto_pr_review.cog", "AutoPRReviewCog")
+    lines = [line[1:] for line in fixtures.unified_diff(40, int(2500 * scale)).splitlines()]
+    return (lambda: cog.filter_lines(lines)), len(lines)
+
+
+def _parse_atom_entries(scale: float):
+    _, cog = _bare("bot.features.auto_pr_review.cog", "AutoPRReviewCog")
+    entries = int(5000 * scale)
+    xml_text = fixtures.atom_feed(entries)
+    return (lambda: cog.parse_atom_entries(xml_text)), entries
+
+
+def _ignore_files(scale: float):
+    _, cog = _bare("bot.features.auto_pr_review.cog", "AutoPRReviewCog")
+    paths = fixtures.repo_tree(int(50000 * scale))
+    return (lambda: cog.filter_ignored_paths(paths)), len(paths)
+
+
+def _recorder_write(scale: float):
+    mod = importlib.import_module("bot.features.meeting_notes.cog")
+    packets = fixtures.opus_packets(60 * scale)
+    user = SimpleNamespace(id=1, name="bench")
+    path = os.path.join(tempfile.mkdtemp(prefix="utilitybot-bench-"), "audio.opusarc")
+
+    def run():
+        archive = mod.OpusArchiveWriter(path)
+        recorder = mod.CombinedRecorder(archive)
+        for packet in packets:
+            recorder.write(user, SimpleNamespace(opus=packet))
+        archive.close()
+        os.remove(path)
+
+    return run, len(packets)
+
+
+def _decode_archive(scale: float):
+    archive = importlib.import_module("bot.features.meeting_notes.archive")
+    # two speakers taking turns every 10 seconds, 20 ms packets as Discord sends them
+    packets = fixtures.opus_packets(600 * scale)
+    workdir = tempfile.mkdtemp(prefix="utilitybot-bench-")
+    path = os.path.join(workdir, "audio.opusarc")
+    writer = archive.OpusArchiveWriter(path)
+    for i, packet in enumerate(packets):
+        writer.append(1 + (i // 500) % 2, packet, i * 20_000)
+    writer.close()
+    wav_path = os.path.join(workdir, "decoded.wav")
+
+    def run():
+        archive.decode_archive(path, wav_path)
+
+    return run, len(packets)
+
+
+def _get_full_path(scale: float):
+    _, cog = _bare("bot.features.smart_qa.cog", "SmartQACog")
+    docs = fixtures.document_tree(int(5000 * scale), depth=40)
+    by_id = {doc["id"]: doc for doc in docs}
+
+    def run():
+        for doc in docs:
+            cog._get_full_path(doc, by_id)
+
+    return run, len(docs)
+
+
+BENCHMARKS = (
+    Benchmark("auto_pr_review.extract_changes", "lines", _extract_changes),
+    Benchmark("auto_pr_review.filter_lines", "lines", _filter_lines),
+    Benchmark("auto_pr_review.parse_atom_entries", "entries", _parse_atom_entries),
+    Benchmark("auto_pr_review.ignore_files", "paths", _ignore_files),
+    Benchmark("meeting_notes.recorder_write", "packets", _recorder_write),
+    Benchmark("meeting_notes.decode_archive", "packets", _decode_archive),
+    Benchmark("smart_qa.get_full_path", "docs", _get_full_path),
+)
@@ -0,0 +1,115 @@
+"""Deterministic synthetic inputs for the benchmarks. Nothing here touches the network."""
+import random
+from xml.sax.saxutils import escape
+
+_WORDS = (
+    "motor battery controller throttle brake sensor voltage current firmware "
+    "update refactor fix add remove config handler parse telemetry display"
+).split()
+
+_CODE_LINES = (
+    "import numpy as np",
+    "from typing import List",
+    "# adjust the throttle curve",
+    '"""Docstring for the helper."""',
+    "def compute_{w}(value, limit):",
+    "    return min(value * {n}, limit)",
+    "    self.{w}_state = {n}",
+    "    if {w} > {n}:",
+    "        raise ValueError('{w} out of range')",
+    "{w}_table = [{n}, {n}, {n}]",
+    "",
+)
+
+_EXTENSIONS = (".py", ".c", ".h", ".ts", ".tsx", ".md", ".png", ".json", ".csv", ".txt", ".yml")
+_DIRS = ("src", "firmware", "app", "docs", "assets", "mock", "test_data", "lib", "drivers", "ui")
+
+
+def _code_line(rng: random.Random) -> str:
+    return rng.choice(_CODE_LINES).format(w=rng.choice(_WORDS), n=rng.randint(0, 999))
+
+
+def unified_diff(files: int, lines_per_file: int, seed: int = 0) -> str:
+    """A multi-file unified diff with a mix of added, removed and context lines."""
+    rng = random.Random(seed)
+    out = []
+    for i in range(files):
+        path = f"src/module_{i}/{rng.choice(_WORDS)}.py"
+        out.append(f"diff --git a/{path} b/{path}")
+        out.append(f"--- a/{path}")
+        out.append(f"+++ b/{path}")
+        out.append(f"@@ -1,{lines_per_file} +1,{lines_per_file} @@")
+        for _ in range(lines_per_file):
+            prefix = rng.choice("+- ")
+            out.append(prefix + _code_line(rng))
+    return "\n".join(out)
+
+
+def atom_feed(entries: int, seed: int = 0) -> str:
+    """A GitHub-style commits Atom feed."""
+    rng = random.Random(seed)
+    parts = [
+        '<?xml version="1.0" encoding="UTF-8"?>',
+        '<feed xmlns="http://www.w3.org/2005/Atom" xmlns:media="http://search.yahoo.com/mrss/" xml:lang="en-US">',
+        "<id>tag:github.com,2008:/Electrium-Mobility/bench/commits/main</id>",
+        "<title>Recent Commits to bench:main</title>",
+    ]
+    for i in range(entries):
+        sha = f"{rng.getrandbits(160):040x}"
+        title = escape(" ".join(rng.choice(_WORDS) for _ in range(8)))
+        parts.append(
+            "<entry>"
+            f"<id>tag:github.com,2008:Grit::Commit/{sha}</id>"
+            f'<link type="text/html" rel="alternate" href="https://github.com/Electrium-Mobility/bench/commit/{sha}"/>'
+            f"<title>{title}</title>"
+            f"<updated>2025-01-{1 + i % 28:02d}T12:00:00Z</updated>"
+            f"<author><name>dev{i % 17}</name><uri>https://github.com/dev{i % 17}</uri></author>"
+            f'<content type="html">&lt;pre&gt;{title}&lt;/pre&gt;</content>'
+            "</entry>"
+        )
+    parts.append("</feed>")
+    return "".join(parts)
+
+
+def repo_tree(paths: int, seed: int = 0) -> list:
+    """File paths shaped like a recursive git tree listing."""
+    rng = random.Random(seed)
+    out = []
+    for _ in range(paths):
+        depth = rng.randint(1, 6)
+        dirs = "/".join(rng.choice(_DIRS) for _ in range(depth))
+        out.append(f"{dirs}/{rng.choice(_WORDS)}_{rng.randint(0, 9999)}{rng.choice(_EXTENSIONS)}")
+    return out
+
+
+def document_tree(docs: int, depth: int, seed: int = 0) -> list:
+    """Outline-style documents forming chains up to ``depth`` levels deep."""
+    rng = random.Random(seed)
+    out = []
+    for i in range(docs):
+        level = i % depth
+        parent = f"doc-{i - 1}" if level else None
+        out.append({
+            "id": f"doc-{i}",
+            "title": f"{rng.choice(_WORDS).title()} {i}",
+            "parentDocumentId": parent,
+        })
+    return out
+
+
+def opus_packets(seconds: float, seed: int = 0) -> list:
+    """20 ms Opus packets of a noisy tone, encoded at 48 kHz mono like Discord voice."""
+    import numpy as np
+    import opuslib
+
+    rng = np.random.default_rng(seed)
+    encoder = opuslib.Encoder(48000, 1, opuslib.APPLICATION_VOIP)
+    frame = 960
+    frames = int(seconds * 50)
+    t = np.arange(frame) / 48000
+    packets = []
+    for i in range(frames):
+        tone = 0.3 * np.sin(2 * np.pi * (220 + i % 200) * t) + 0.05 * rng.standard_normal(frame)
+        pcm = (tone * 32767).astype(np.int16).tobytes()
+        packets.append(encoder.encode(pcm, frame))
+    return packets
@@ -0,0 +1,126 @@
+"""Run the offline benchmarks, compare against saved baselines and optionally update them.
+
+Usage:
+    python -m benchmarks.run                  # run all, compare with baselines.json
+    python -m benchmarks.run --save           # run all and store the results as the new baseline
+    python -m benchmarks.run --only parse_atom --scale 0.1
+"""
+import argparse
+import gc
+import json
+import os
+import sys
+import time
+import tracemalloc
+from typing import Dict, Optional
+
+from benchmarks.cases import BENCHMARKS, Benchmark
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(__file__), "baselines.json")
+
+
+def _measure(bench: Benchmark, scale: float, repeat: int) -> Dict[str, float]:
+    fn, items = bench.prepare(scale)
+
+    fn()  # warm-up: first-call imports and caches
+    timings = []
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+
+    # Peak memory is taken on a separate run since tracing slows everything down
+    gc.collect()
+    tracemalloc.start()
+    try:
+        fn()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    best = min(timings)
+    return {
+        "items": items,
+        "seconds": best,
+        "throughput": items / best if best else 0.0,
+        "peak_bytes": peak,
+        "scale": scale,
+    }
+
+
+def _load_baselines(path: str) -> Dict[str, dict]:
+    if not os.path.exists(path):
+        return {}
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _regression(result: dict, baseline: Optional[dict], threshold: float) -> Optional[str]:
+    if not baseline or baseline.get("scale") != result["scale"]:
+        return None
+    problems = []
+    if result["throughput"] < baseline["throughput"] * (1 - threshold):
+        drop = 1 - result["throughput"] / baseline["throughput"]
+        problems.append(f"throughput -{drop:.0%}")
+    if baseline["peak_bytes"] and result["peak_bytes"] > baseline["peak_bytes"] * (1 + threshold):
+        growth = result["peak_bytes"] / baseline["peak_bytes"] - 1
+        problems.append(f"peak memory +{growth:.0%}")
+    return ", ".join(problems) or None
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--only", nargs="*", default=None, help="substrings of benchmark names to run")
+    parser.add_argument("--scale", type=float, default=1.0, help="multiply fixture sizes")
+    parser.add_argument("--repeat", type=int, default=5, help="timed runs per benchmark, best is kept")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="baseline JSON file")
+    parser.add_argument("--threshold", type=float, default=0.15, help="allowed relative slowdown or memory growth")
+    parser.add_argument("--save", action="store_true", help="write results to the baseline file")
+    args = parser.parse_args(argv)
+
+    baselines = _load_baselines(args.baseline)
+    results: Dict[str, dict] = {}
+    regressions = 0
+
+    print(f"{'benchmark':<36} {'items':>9} {'best':>9} {'throughput':>16} {'peak':>10}  status")
+    for bench in BENCHMARKS:
+        if args.only and not any(s in bench.name for s in args.only):
+            continue
+        try:
+            result = _measure(bench, args.scale, args.repeat)
+        except (ImportError, OSError) as e:
+            # e.g. opuslib or the Opus DLL is not available on this machine
+            print(f"{bench.name:<36} skipped: {e}")
+            continue
+        results[bench.name] = result
+
+        problem = _regression(result, baselines.get(bench.name), args.threshold)
+        if problem:
+            regressions += 1
+            status = f"REGRESSION ({problem})"
+        elif bench.name in baselines and baselines[bench.name].get("scale") == args.scale:
+            change = result["throughput"] / baselines[bench.name]["throughput"] - 1
+            status = f"ok ({change:+.0%})"
+        else:
+            status = "no baseline"
+        print(
+            f"{bench.name:<36} {result['items']:>9} {result['seconds'] * 1000:>7.1f}ms "
+            f"{result['throughput']:>10.0f} {bench.unit + '/s':<5} "
+            f"{result['peak_bytes'] / 2**20:>7.1f}MiB  {status}"
+        )
+
+    if args.save:
+        baselines.update(results)
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(baselines, f, indent=2, sort_keys=True)
+        print(f"Saved {len(results)} baseline(s) to {args.baseline}")
+
+    if regressions:
+        print(f"{regressions} benchmark(s) regressed by more than {args.threshold:.0%}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
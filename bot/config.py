@@ -1,17 +1,111 @@
 import os
 from dataclasses import dataclass
+from typing import Dict, Optional, Tuple
+
+from dotenv import load_dotenv
 
 
 @dataclass(frozen=True)
 class Settings:
     """Bot settings loaded from environment variables."""
     token: str
+    llm_max_concurrency: int
+    llm_feature_concurrency: int
+    llm_feature_limits: Dict[str, int]
+    llm_max_retries: int
+    lazy_extensions: Tuple[str, ...]
+    cold_start_target_seconds: float
+    metrics_port: int
+    loop_lag_threshold_seconds: float
+    github_api_url: str
+    github_web_url: str
+    github_graphql: bool
+    deepseek_api_url: str
+    deepgram_api_url: str
+    outline_api_url: str
+    data_dir: str
+    sharded: bool
+    shard_count: Optional[int]
+    shard_workers: int
+    log_level: str
+    log_json: bool
+    log_file: Optional[str]
+    job_workers: int
+    job_threads: int
+    job_processes: int
+    meeting_retention_days: float
+    low_memory: bool
+    max_messages: Optional[int]
+    chunk_guilds_at_startup: bool
+    memory_trace: bool
+
+
+def _split_list(value: str) -> Tuple[str, ...]:
+    return tuple(item.strip() for item in value.split(",") if item.strip())
+
+
+def _feature_limits(value: str) -> Dict[str, int]:
+    # "feature=n,feature=n" overrides of the per-feature LLM concurrency
+    limits = {}
+    for item in _split_list(value):
+        feature, _, limit = item.partition("=")
+        limits[feature.strip()] = int(limit)
+    return limits
+
+
+def _base_url(name: str, default: str) -> str:
+    # stored without a trailing slash so callers can append "/path"
+    return os.getenv(name, default).rstrip("/")
+
+
+def _flag(name: str, default: bool) -> bool:
+    value = os.getenv(name)
+    if value is None or not value.strip():
+        return default
+    return value.strip().lower() in {"1", "true", "yes", "on"}
 
 
 def load_settings() -> Settings:
     """Load settings from environment variables."""
+    load_dotenv()
     token = os.getenv("DISCORD_TOKEN", "")
-    return Settings(token=token)
+    # MEMORY_PROFILE=low changes the default below; it can still be set explicitly
+    low_memory = os.getenv("MEMORY_PROFILE", "default").strip().lower() == "low"
+    max_messages = int(os.getenv("MAX_MESSAGES", "100" if low_memory else "1000"))
+    return Settings(
+        token=token,
+        llm_max_concurrency=int(os.getenv("LLM_MAX_CONCURRENCY", "4")),
+        llm_feature_concurrency=int(os.getenv("LLM_FEATURE_CONCURRENCY", "2")),
+        # per-file PR reviews fan out one call per file
+        llm_feature_limits=_feature_limits(os.getenv("LLM_FEATURE_LIMITS", "auto_pr_review=4")),
+        llm_max_retries=int(os.getenv("LLM_MAX_RETRIES", "3")),
+        lazy_extensions=_split_list(os.getenv("LAZY_EXTENSIONS", "")),
+        cold_start_target_seconds=float(os.getenv("COLD_START_TARGET_SECONDS", "0")),
+        metrics_port=int(os.getenv("METRICS_PORT", "0")),
+        loop_lag_threshold_seconds=float(os.getenv("LOOP_LAG_THRESHOLD_SECONDS", "0.25")),
+        github_api_url=_base_url("GITHUB_API_URL", "https://api.github.com"),
+        github_graphql=_flag("GITHUB_GRAPHQL", False),
+        github_web_url=_base_url("GITHUB_WEB_URL", "https://github.com"),
+        deepseek_api_url=_base_url("DEEPSEEK_API_URL", "https://api.deepseek.com"),
+        deepgram_api_url=_base_url("DEEPGRAM_API_URL", "https://api.deepgram.com"),
+        outline_api_url=_base_url("OUTLINE_API_URL", ""),
+        data_dir=os.getenv("DATA_DIR", "data"),
+        sharded=_flag("SHARDED", False),
+        shard_count=int(os.getenv("SHARD_COUNT", "0")) or None,
+        shard_workers=int(os.getenv("SHARD_WORKERS", "1")),
+        log_level=os.getenv("LOG_LEVEL", "INFO").upper(),
+        log_json=os.getenv("LOG_FORMAT", "text").lower() == "json",
+        log_file=os.getenv("LOG_FILE") or None,
+        job_workers=int(os.getenv("JOB_WORKERS", "2")),
+        job_threads=int(os.getenv("JOB_THREADS", "4")),
+        job_processes=int(os.getenv("JOB_PROCESSES", "2")),
+        meeting_retention_days=float(os.getenv("MEETING_RETENTION_DAYS", "30")),
+        low_memory=low_memory,
+        max_messages=max_messages or None,  # 0 disables the message cache
+        # only applies with the members intent, which the bot doesn't request by default
+        chunk_guilds_at_startup=_flag("CHUNK_GUILDS_AT_STARTUP", False),
+        memory_trace=_flag("MEMORY_TRACE", False),
+    )
 
 
-settings = load_settings()
\ No newline at end of file
+settings = load_settings()
@@ -0,0 +1,169 @@
+import time
+import tracemalloc
+
+from discord.ext import commands
+
+from bot.config import settings
+from bot.core.jobs import FAILED, RUNNING, get_scheduler
+from bot.core.llm import get_llm_gateway
+from bot.core.memory import (
+    budgets, discord_cache_stats, rss_bytes, start_tracing, stop_tracing, subsystem_breakdown,
+)
+from bot.core.metrics import metrics
+from bot.core.sharding import read_shard_health, shard_health
+
+# health files older than this are reported as stale
+STALE_HEALTH_SECONDS = 90
+
+
+def _ms(seconds: float) -> str:
+    return f"{seconds * 1000:.0f}ms"
+
+
+def _mib(size: int) -> str:
+    return f"{size / 2**20:.1f} MiB"
+
+
+class AdminCog(commands.Cog):
+    """Owner-only commands for inspecting the running bot."""
+
+    def __init__(self, bot: commands.Bot):
+        self.bot = bot
+
+    async def cog_check(self, ctx: commands.Context) -> bool:
+        return await self.bot.is_owner(ctx.author)
+
+    @commands.command(name="stats")
+    async def stats(self, ctx: commands.Context):
+        """Show command, dependency, LLM and event-loop timings."""
+        lines = ["**Commands** (count | p50 | p99 | errors)"]
+        for name, hist in sorted(metrics.commands.items()):
+            lines.append(
+                f"- `{name}`: {hist.count} | {_ms(hist.quantile(0.5))} | "
+                f"{_ms(hist.quantile(0.99))} | {hist.errors}"
+            )
+
+        lines.append("**Dependencies** (count | p50 | p99 | errors)")
+        for name, hist in sorted(metrics.dependencies.items()):
+            lines.append(
+                f"- `{name}`: {hist.count} | {_ms(hist.quantile(0.5))} | "
+                f"{_ms(hist.quantile(0.99))} | {hist.errors}"
+            )
+
+        gateway = get_llm_gateway()
+        lines.append(f"**LLM** (circuit {gateway.circuit_state})")
+        for feature, s in sorted(gateway.stats().items()):
+            lines.append(
+                f"- `{feature}`: {s.requests} calls, {s.failures} failed, {s.retries} retries, "
+                f"{s.prompt_tokens}+{s.completion_tokens} tokens, avg {_ms(s.avg_latency)}"
+            )
+
+        lag = metrics.loop_lag
+        lines.append(
+            f"**Event loop** lag p50 {_ms(lag.quantile(0.5))}, p99 {_ms(lag.quantile(0.99))}, "
+            f"max {_ms(lag.max)}, stalls {metrics.stalls}"
+        )
+
+        report = getattr(self.bot, "extension_load_report", None)
+        if report is not None:
+            lines.append(f"**Startup** extensions loaded in {report.total_seconds:.2f}s")
+            for r in report.results:
+                state = "failed" if not r.ok else ("lazy" if r.lazy else "ok")
+                lines.append(f"- `{r.name}`: {state}, imports {_ms(r.import_seconds)}, setup {_ms(r.setup_seconds)}")
+
+        await ctx.send("\n".join(lines)[:2000])
+
+    @commands.command(name="shards")
+    async def shards(self, ctx: commands.Context):
+        """Show gateway latency and guild counts for every shard across all workers."""
+        reports = read_shard_health(settings.data_dir)
+        if not reports:
+            reports = [shard_health(self.bot, getattr(self.bot, "worker_index", 0))]
+
+        lines = []
+        now = time.time()
+        for report in reports:
+            age = now - report["updated"]
+            flags = []
+            if report["leader"]:
+                flags.append("leader")
+            if age > STALE_HEALTH_SECONDS:
+                flags.append(f"stale {age:.0f}s")
+            suffix = f" ({', '.join(flags)})" if flags else ""
+            lines.append(f"**Worker {report['worker']}** pid {report['pid']}{suffix}")
+            for shard in report["shards"]:
+                state = "closed" if shard["closed"] else ("ratelimited" if shard["ratelimited"] else "ok")
+                lines.append(
+                    f"- shard {shard['id']}: {_ms(shard['latency'])}, {shard['guilds']} guilds, {state}"
+                )
+
+        await ctx.send("\n".join(lines)[:2000])
+
+    @commands.command(name="jobs")
+    async def jobs(self, ctx: commands.Context):
+        """Show queued and running background jobs and recent failures."""
+        scheduler = get_scheduler()
+        depth = scheduler.queue_depth()
+        lines = ["**Queue** " + ", ".join(f"{name} {count}" for name, count in depth.items())]
+
+        running = scheduler.jobs(RUNNING)
+        lines.append(f"**Running** ({len(running)})")
+        now = time.time()
+        for job in running:
+            note = f" {job.note}" if job.note else ""
+            lines.append(
+                f"- `{job.kind}` {job.id}: {job.progress:.0%}{note}, attempt {job.attempts}, "
+                f"{now - job.created:.0f}s old"
+            )
+
+        failed = scheduler.jobs(FAILED)[-5:]
+        if failed:
+            lines.append("**Recent failures**")
+            for job in failed:
+                lines.append(f"- `{job.kind}` {job.id}: {job.error}")
+
+        await ctx.send("\n".join(lines)[:2000])
+
+    @commands.command(name="memory")
+    async def memory(self, ctx: commands.Context, action: str = ""):
+        """Show memory use by subsystem. `!memory trace` / `!memory stop` toggle tracemalloc."""
+        if action == "trace":
+            start_tracing()
+            await ctx.send("tracemalloc started; allocations from now on are attributed.")
+            return
+        if action == "stop":
+            stop_tracing()
+            await ctx.send("tracemalloc stopped.")
+            return
+
+        rss = rss_bytes()
+        profile = "low" if settings.low_memory else "default"
+        lines = [f"**Memory** profile {profile}, RSS {_mib(rss) if rss is not None else 'n/a'}"]
+
+        lines.append("**Budgets** (used / limit)")
+        for name, budget in sorted(budgets.budgets.items()):
+            used = budget.used
+            flag = " ⚠️" if used > budget.limit else ""
+            lines.append(f"- `{name}`: {_mib(used)} / {_mib(budget.limit)}{flag}")
+
+        caches = discord_cache_stats(self.bot)
+        lines.append(
+            f"**Discord cache** {caches['guilds']} guilds, {caches['members']} members, "
+            f"{caches['users']} users, {caches['messages']} messages (max {settings.max_messages})"
+        )
+
+        if tracemalloc.is_tracing():
+            # taking the snapshot walks every traced block, keep it off the event loop
+            breakdown = await self.bot.loop.run_in_executor(None, subsystem_breakdown)
+            traced, peak = tracemalloc.get_traced_memory()
+            lines.append(f"**tracemalloc** {_mib(traced)} traced, peak {_mib(peak)}")
+            for name, size in breakdown:
+                lines.append(f"- `{name}`: {_mib(size)}")
+        else:
+            lines.append("tracemalloc is off, `!memory trace` or MEMORY_TRACE=1 to attribute allocations.")
+
+        await ctx.send("\n".join(lines)[:2000])
+
+
+async def setup(bot: commands.Bot):
+    await bot.add_cog(AdminCog(bot))
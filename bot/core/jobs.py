@@ -0,0 +1,271 @@
+import asyncio
+import itertools
+import json
+import logging
+import multiprocessing
+import os
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import asdict, dataclass, field
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from bot.config import settings
+from bot.core.llm import Priority
+
+logger = logging.getLogger(__name__)
+
+PENDING = "pending"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+
+# finished jobs kept in the state file for !jobs
+KEEP_FINISHED = 50
+# progress reports are written out at most this often; state changes are saved right away
+REPORT_SAVE_DELAY = 1.0
+
+
+@dataclass
+class Job:
+    """A unit of background work. ``payload`` and ``result`` must be JSON serialisable."""
+    kind: str
+    payload: dict
+    priority: int = Priority.BACKGROUND
+    id: str = field(default_factory=lambda: uuid.uuid4().hex[:12])
+    state: str = PENDING
+    attempts: int = 0
+    progress: float = 0.0
+    note: str = ""
+    result: Any = None
+    error: Optional[str] = None
+    created: float = field(default_factory=time.time)
+    updated: float = field(default_factory=time.time)
+
+
+@dataclass
+class _Kind:
+    handler: Callable[["JobContext"], Awaitable[Any]]
+    on_done: Optional[Callable[[Job], Awaitable[None]]]
+    max_attempts: int
+
+
+class JobContext:
+    """Handed to job handlers for progress reporting and access to the executors."""
+
+    def __init__(self, scheduler: "JobScheduler", job: Job):
+        self.scheduler = scheduler
+        self.job = job
+
+    @property
+    def payload(self) -> dict:
+        return self.job.payload
+
+    def report(self, progress: float, note: str = "") -> None:
+        """Record progress between 0 and 1 with an optional short note."""
+        self.job.progress = max(0.0, min(1.0, progress))
+        self.job.note = note
+        self.job.updated = time.time()
+        self.scheduler._save_soon()
+
+    async def run_blocking(self, fn: Callable, *args):
+        return await self.scheduler.run_blocking(fn, *args)
+
+    async def run_cpu(self, fn: Callable, *args):
+        return await self.scheduler.run_cpu(fn, *args)
+
+
+class JobScheduler:
+    """Priority job queue with persisted state, a bounded thread pool and a process pool.
+
+    Cogs register a handler per job kind and an optional ``on_done``
+    callback that receives the finished (or failed) job, then ``submit``
+    payloads. Job state is written to ``state_path`` on every change
+    (progress reports at most once a second); on start, jobs that were
+    pending or running when the bot stopped are queued again, so handlers
+    should be safe to re-run from the start.
+    """
+
+    def __init__(self, workers: int = 2, io_threads: int = 4, cpu_processes: int = 2):
+        self.workers = workers
+        self.io_threads = io_threads
+        self.cpu_processes = cpu_processes
+        self.state_path: Optional[str] = None
+        self._kinds: Dict[str, _Kind] = {}
+        self._jobs: Dict[str, Job] = {}
+        self._queue: Optional[asyncio.PriorityQueue] = None
+        self._seq = itertools.count()
+        self._tasks: List[asyncio.Task] = []
+        self._threads: Optional[ThreadPoolExecutor] = None
+        self._processes: Optional[ProcessPoolExecutor] = None
+        self._save_handle: Optional[asyncio.TimerHandle] = None
+
+    def register(
+        self,
+        kind: str,
+        handler: Callable[[JobContext], Awaitable[Any]],
+        on_done: Optional[Callable[[Job], Awaitable[None]]] = None,
+        max_attempts: int = 3,
+    ) -> None:
+        """Register (or replace) the handler for a job kind and queue any jobs waiting for it."""
+        self._kinds[kind] = _Kind(handler, on_done, max_attempts)
+        if self._queue is not None:
+            for job in self._jobs.values():
+                if job.kind == kind and job.state == PENDING:
+                    self._enqueue(job)
+
+    async def submit(self, kind: str, payload: dict, priority: int = Priority.BACKGROUND) -> Job:
+        job = Job(kind=kind, payload=payload, priority=int(priority))
+        self._jobs[job.id] = job
+        self._save()
+        if self._queue is not None and kind in self._kinds:
+            self._enqueue(job)
+        return job
+
+    async def start(self, state_path: Optional[str] = None) -> None:
+        """Load persisted jobs, re-queue unfinished ones and start the workers."""
+        self.state_path = state_path
+        self._queue = asyncio.PriorityQueue()
+        self._load()
+        for job in self._jobs.values():
+            if job.state == RUNNING:
+                logger.info("Resuming interrupted job %s (%s)", job.id, job.kind)
+                job.state = PENDING
+                # the run cut off by the shutdown didn't fail, so it doesn't count
+                job.attempts = max(0, job.attempts - 1)
+            if job.state == PENDING and job.kind in self._kinds:
+                self._enqueue(job)
+        self._save()
+        self._tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        # jobs cut off here are still marked running and resume on the next start
+        self._save()
+        if self._threads is not None:
+            self._threads.shutdown(wait=False, cancel_futures=True)
+        if self._processes is not None:
+            self._processes.shutdown(wait=False, cancel_futures=True)
+
+    async def run_blocking(self, fn: Callable, *args):
+        """Run blocking I/O on the scheduler's bounded thread pool."""
+        if self._threads is None:
+            self._threads = ThreadPoolExecutor(self.io_threads, thread_name_prefix="jobs-io")
+        return await asyncio.get_running_loop().run_in_executor(self._threads, fn, *args)
+
+    async def run_cpu(self, fn: Callable, *args):
+        """Run CPU-heavy work in the process pool. ``fn`` and its arguments must be picklable."""
+        if self._processes is None:
+            # spawn behaves the same on Windows and Linux and avoids forking a threaded process
+            self._processes = ProcessPoolExecutor(
+                self.cpu_processes, mp_context=multiprocessing.get_context("spawn")
+            )
+        return await asyncio.get_running_loop().run_in_executor(self._processes, fn, *args)
+
+    def queue_depth(self) -> Dict[str, int]:
+        """Pending job counts keyed by priority name."""
+        depth = {p.name.lower(): 0 for p in Priority}
+        for job in self._jobs.values():
+            if job.state == PENDING:
+                depth[Priority(job.priority).name.lower()] += 1
+        return depth
+
+    def jobs(self, *states: str) -> List[Job]:
+        jobs = [job for job in self._jobs.values() if not states or job.state in states]
+        return sorted(jobs, key=lambda j: j.created)
+
+    def _enqueue(self, job: Job) -> None:
+        self._queue.put_nowait((job.priority, next(self._seq), job.id))
+
+    async def _worker(self) -> None:
+        while True:
+            _, _, job_id = await self._queue.get()
+            job = self._jobs.get(job_id)
+            if job is None or job.state != PENDING:
+                continue
+            await self._run(job)
+
+    async def _run(self, job: Job) -> None:
+        kind = self._kinds[job.kind]
+        job.state = RUNNING
+        job.attempts += 1
+        job.updated = time.time()
+        self._save()
+        try:
+            job.result = await kind.handler(JobContext(self, job))
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            job.error = repr(e)
+            if job.attempts < kind.max_attempts:
+                delay = 5 * job.attempts
+                logger.warning("Job %s (%s) failed: %r, retrying in %ds", job.id, job.kind, e, delay)
+                job.state = PENDING
+                job.updated = time.time()
+                self._save()
+                asyncio.get_running_loop().call_later(delay, self._enqueue, job)
+                return
+            logger.exception("Job %s (%s) failed after %d attempts", job.id, job.kind, job.attempts)
+            job.state = FAILED
+        else:
+            job.state = DONE
+            job.progress = 1.0
+            job.error = None
+        job.updated = time.time()
+        self._prune()
+        self._save()
+
+        if kind.on_done is not None:
+            try:
+                await kind.on_done(job)
+            except Exception:
+                logger.exception("Completion callback for job %s (%s) failed", job.id, job.kind)
+
+    def _prune(self) -> None:
+        for job in self.jobs(DONE, FAILED)[:-KEEP_FINISHED]:
+            del self._jobs[job.id]
+
+    def _load(self) -> None:
+        if not self.state_path or not os.path.exists(self.state_path):
+            return
+        try:
+            with open(self.state_path, "r", encoding="utf-8") as f:
+                for raw in json.load(f):
+                    job = Job(**raw)
+                    self._jobs.setdefault(job.id, job)
+        except (OSError, ValueError, TypeError):
+            logger.exception("Could not read job state from %s", self.state_path)
+
+    def _save_soon(self) -> None:
+        if self._save_handle is None:
+            self._save_handle = asyncio.get_running_loop().call_later(REPORT_SAVE_DELAY, self._save)
+
+    def _save(self) -> None:
+        if self._save_handle is not None:
+            self._save_handle.cancel()
+            self._save_handle = None
+        if not self.state_path:
+            return
+        os.makedirs(os.path.dirname(self.state_path) or ".", exist_ok=True)
+        tmp = self.state_path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump([asdict(job) for job in self._jobs.values()], f, default=str)
+        os.replace(tmp, self.state_path)
+
+
+_scheduler: Optional[JobScheduler] = None
+
+
+def get_scheduler() -> JobScheduler:
+    """Return the process-wide scheduler, creating it on first use."""
+    global _scheduler
+    if _scheduler is None:
+        _scheduler = JobScheduler(
+            workers=settings.job_workers,
+            io_threads=settings.job_threads,
+            cpu_processes=settings.job_processes,
+        )
+    return _scheduler
@@ -0,0 +1,337 @@
+import asyncio
+import enum
+import heapq
+import itertools
+import logging
+import os
+import random
+import time
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+import aiohttp
+
+from bot.config import settings
+from bot.core.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+# Status codes worth retrying: rate limiting and transient server errors
+RETRYABLE_STATUS = {429, 500, 502, 503, 504}
+
+
+class Priority(enum.IntEnum):
+    """Admission lanes. Lower values are served first."""
+    INTERACTIVE = 0
+    BACKGROUND = 1
+
+
+class LLMError(Exception):
+    """Raised when a chat completion could not be produced."""
+
+
+class LLMUnavailable(LLMError):
+    """Raised when the gateway refuses a call (no API key or circuit open)."""
+
+
+@dataclass
+class FeatureStats:
+    """Token and latency counters for one feature."""
+    requests: int = 0
+    failures: int = 0
+    retries: int = 0
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    total_latency: float = 0.0
+    max_latency: float = 0.0
+
+    @property
+    def avg_latency(self) -> float:
+        return self.total_latency / self.requests if self.requests else 0.0
+
+
+class _PrioritySemaphore:
+    """Semaphore that hands freed slots to the highest-priority waiter."""
+
+    def __init__(self, value: int):
+        self._value = value
+        self._waiters: list = []
+        self._seq = itertools.count()
+
+    async def acquire(self, priority: int) -> None:
+        if self._value > 0 and not self._waiters:
+            self._value -= 1
+            return
+        fut = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (priority, next(self._seq), fut))
+        try:
+            await fut
+        except asyncio.CancelledError:
+            # The slot may have been handed to us right before cancellation
+            if fut.done() and not fut.cancelled():
+                self.release()
+            raise
+
+    def release(self) -> None:
+        while self._waiters:
+            _, _, fut = heapq.heappop(self._waiters)
+            if not fut.done():
+                fut.set_result(None)
+                return
+        self._value += 1
+
+
+class _CircuitBreaker:
+    """Opens after consecutive failures and lets one probe through after a cooldown."""
+
+    def __init__(self, threshold: int, cooldown: float):
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self._probing = False
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        if time.monotonic() - self.opened_at >= self.cooldown:
+            return "half-open"
+        return "open"
+
+    def allow(self) -> bool:
+        state = self.state
+        if state == "closed":
+            return True
+        if state == "half-open" and not self._probing:
+            self._probing = True
+            return True
+        return False
+
+    def record_success(self) -> None:
+        self.failures = 0
+        self.opened_at = None
+        self._probing = False
+
+    def end_probe(self) -> None:
+        """Let another probe through if this one ended without a verdict (cancelled, bad response)."""
+        self._probing = False
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        self._probing = False
+        if self.opened_at is not None or self.failures >= self.threshold:
+            if self.opened_at is None:
+                logger.warning("LLM circuit opened after %d consecutive failures", self.failures)
+            self.opened_at = time.monotonic()
+
+
+class LLMGateway:
+    """Shared async client for DeepSeek chat completions.
+
+    Keeps one pooled aiohttp session, bounds concurrency globally and per
+    feature, retries transient failures with jittered backoff and records
+    per-feature token and latency counters.
+    """
+
+    def __init__(
+        self,
+        *,
+        api_url: Optional[str] = None,
+        max_concurrency: int = 4,
+        feature_concurrency: int = 2,
+        feature_limits: Optional[Dict[str, int]] = None,
+        max_retries: int = 3,
+        base_delay: float = 0.5,
+        max_delay: float = 8.0,
+        timeout: float = 60.0,
+        breaker_threshold: int = 5,
+        breaker_cooldown: float = 30.0,
+    ):
+        self.api_url = api_url or f"{settings.deepseek_api_url}/v1/chat/completions"
+        self.max_concurrency = max_concurrency
+        self.feature_concurrency = feature_concurrency
+        self.feature_limits = dict(feature_limits or {})
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.timeout = timeout
+        self._global = _PrioritySemaphore(max_concurrency)
+        self._features: Dict[str, _PrioritySemaphore] = {}
+        self._breaker = _CircuitBreaker(breaker_threshold, breaker_cooldown)
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._stats: Dict[str, FeatureStats] = {}
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(limit=self.max_concurrency, keepalive_timeout=60)
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(total=self.timeout),
+            )
+        return self._session
+
+    def _feature_gate(self, feature: str) -> _PrioritySemaphore:
+        gate = self._features.get(feature)
+        if gate is None:
+            limit = self.feature_limits.get(feature, self.feature_concurrency)
+            gate = self._features[feature] = _PrioritySemaphore(limit)
+        return gate
+
+    def stats(self) -> Dict[str, FeatureStats]:
+        """Return per-feature counters keyed by feature name."""
+        return dict(self._stats)
+
+    @property
+    def circuit_state(self) -> str:
+        return self._breaker.state
+
+    @property
+    def configured(self) -> bool:
+        """False while DEEPSEEK_API_KEY is unset, so background work can skip calls that would fail."""
+        return bool(os.getenv("DEEPSEEK_API_KEY", "").strip())
+
+    @asynccontextmanager
+    async def _slots(self, gate: _PrioritySemaphore, priority: int):
+        # Take the feature slot first so a busy feature never holds a global slot while waiting
+        await gate.acquire(priority)
+        try:
+            await self._global.acquire(priority)
+            try:
+                yield
+            finally:
+                self._global.release()
+        finally:
+            gate.release()
+
+    async def chat(
+        self,
+        messages: List[dict],
+        *,
+        feature: str,
+        model: str = "deepseek-chat",
+        max_tokens: Optional[int] = None,
+        temperature: Optional[float] = None,
+        priority: Priority = Priority.INTERACTIVE,
+    ) -> str:
+        """Run a chat completion and return the stripped message content."""
+        api_key = os.getenv("DEEPSEEK_API_KEY", "").strip()
+        if not api_key:
+            raise LLMUnavailable("DEEPSEEK_API_KEY is not configured")
+
+        payload = {"model": model, "messages": messages}
+        if max_tokens is not None:
+            payload["max_tokens"] = max_tokens
+        if temperature is not None:
+            payload["temperature"] = temperature
+
+        stats = self._stats.setdefault(feature, FeatureStats())
+        gate = self._feature_gate(feature)
+
+        start = time.perf_counter()
+        try:
+            data = await self._post_with_retries(payload, api_key, stats, gate, priority)
+        except LLMError:
+            stats.failures += 1
+            raise
+        finally:
+            elapsed = time.perf_counter() - start
+            stats.requests += 1
+            stats.total_latency += elapsed
+            stats.max_latency = max(stats.max_latency, elapsed)
+
+        usage = data.get("usage") or {}
+        stats.prompt_tokens += usage.get("prompt_tokens", 0)
+        stats.completion_tokens += usage.get("completion_tokens", 0)
+
+        choices = data.get("choices") or []
+        if not choices:
+            raise LLMError("DeepSeek returned no choices")
+        return (((choices[0] or {}).get("message") or {}).get("content") or "").strip()
+
+    async def _post_with_retries(
+        self, payload: dict, api_key: str, stats: FeatureStats, gate: _PrioritySemaphore, priority: int
+    ) -> dict:
+        headers = {
+            "Authorization": f"Bearer {api_key}",
+            "Content-Type": "application/json",
+        }
+        attempt = 0
+        while True:
+            # Slots are held per attempt, so a caller sleeping between retries doesn't block others
+            async with self._slots(gate, priority):
+                probing = self._breaker.state == "half-open"
+                if not self._breaker.allow():
+                    raise LLMUnavailable("DeepSeek circuit is open, skipping call")
+
+                retry_after = None
+                try:
+                    session = self._get_session()
+                    with metrics.timer("deepseek"):
+                        async with session.post(self.api_url, json=payload, headers=headers) as resp:
+                            if resp.status == 200:
+                                data = await resp.json()
+                                self._breaker.record_success()
+                                return data or {}
+                            if resp.status not in RETRYABLE_STATUS:
+                                # Client errors will not improve on retry and say nothing about service health
+                                self._breaker.record_success()
+                                body = await resp.text()
+                                raise LLMError(f"DeepSeek API returned {resp.status}: {body[:200]}")
+                            retry_after = _parse_retry_after(resp.headers.get("Retry-After"))
+                            error = LLMError(f"DeepSeek API returned {resp.status}")
+                except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                    error = LLMError(f"DeepSeek request failed: {e!r}")
+                finally:
+                    if probing:
+                        self._breaker.end_probe()
+
+                self._breaker.record_failure()
+            if attempt >= self.max_retries:
+                raise error
+
+            # Full jitter keeps concurrent retries from synchronising
+            delay = random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+            if retry_after is not None:
+                delay = max(delay, retry_after)
+            attempt += 1
+            stats.retries += 1
+            logger.warning("%s, retrying in %.2fs (attempt %d/%d)", error, delay, attempt, self.max_retries)
+            await asyncio.sleep(delay)
+
+    async def close(self) -> None:
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+
+def _parse_retry_after(value: Optional[str]) -> Optional[float]:
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        return None
+
+
+_gateway: Optional[LLMGateway] = None
+
+
+def get_llm_gateway() -> LLMGateway:
+    """Return the process-wide gateway, creating it on first use."""
+    global _gateway
+    if _gateway is None:
+        _gateway = LLMGateway(
+            max_concurrency=settings.llm_max_concurrency,
+            feature_concurrency=settings.llm_feature_concurrency,
+            feature_limits=settings.llm_feature_limits,
+            max_retries=settings.llm_max_retries,
+        )
+    return _gateway
+
+
+async def close_llm_gateway() -> None:
+    """Close the shared gateway's connection pool if it was created."""
+    if _gateway is not None:
+        await _gateway.close()
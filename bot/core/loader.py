@@ -1,19 +1,213 @@
+import ast
+import asyncio
+import importlib
+import importlib.util
 import logging
 import pkgutil
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Iterable, List, Optional
+
+from discord.ext import commands
+
+from bot.config import settings
 
 logger = logging.getLogger(__name__)
 
+
+@dataclass
+class ExtensionLoadResult:
+    """Timing and outcome of loading one feature extension."""
+    name: str
+    import_seconds: float = 0.0
+    setup_seconds: float = 0.0
+    lazy: bool = False
+    error: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+@dataclass
+class LoadReport:
+    """Per-extension results plus the wall time of the whole load phase."""
+    results: List[ExtensionLoadResult] = field(default_factory=list)
+    total_seconds: float = 0.0
+
+
 def iter_feature_extensions():
     import bot.features
     for _, name, is_pkg in pkgutil.iter_modules(bot.features.__path__):
         if is_pkg:
             yield f"bot.features.{name}.cog"
 
-async def load_feature_extensions(bot):
-    """Load all feature cogs asynchronously."""
+
+def _feature_name(ext: str) -> str:
+    # bot.features.<name>.cog -> <name>
+    return ext.split(".")[-2]
+
+
+def _leading_imports(ext: str) -> List[str]:
+    """Return modules imported at the top of an extension, before any other statement.
+
+    Only the leading import block is used so imports that depend on
+    module-level setup (e.g. opuslib after the DLL is loaded) are left alone.
+    """
+    spec = importlib.util.find_spec(ext)
+    if spec is None or not spec.origin:
+        return []
+    with open(spec.origin, "r", encoding="utf-8") as f:
+        tree = ast.parse(f.read(), filename=spec.origin)
+
+    modules = []
+    for node in tree.body:
+        if isinstance(node, ast.Import):
+            modules.extend(alias.name for alias in node.names)
+        elif isinstance(node, ast.ImportFrom) and node.module and not node.level:
+            modules.append(node.module)
+        elif isinstance(node, ast.Expr) and isinstance(node.value, ast.Constant):
+            continue  # module docstring
+        else:
+            break
+    return modules
+
+
+def _prewarm(ext: str) -> float:
+    """Import an extension's dependencies in a worker thread, returning the time taken."""
+    start = time.perf_counter()
+    for module in _leading_imports(ext):
+        try:
+            importlib.import_module(module)
+        except Exception as e:
+            # The real import inside load_extension will surface the error
+            logger.debug("Prewarm import of %s for %s failed: %s", module, ext, e)
+    return time.perf_counter() - start
+
+
+def _command_names(ext: str) -> List[str]:
+    """Read the command names and aliases declared in an extension without importing it."""
+    spec = importlib.util.find_spec(ext)
+    if spec is None or not spec.origin:
+        return []
+    with open(spec.origin, "r", encoding="utf-8") as f:
+        tree = ast.parse(f.read(), filename=spec.origin)
+
+    names = []
+    for node in ast.walk(tree):
+        if not isinstance(node, ast.AsyncFunctionDef):
+            continue
+        for deco in node.decorator_list:
+            if not (isinstance(deco, ast.Call) and getattr(deco.func, "attr", None) == "command"):
+                continue
+            name = node.name
+            for kw in deco.keywords:
+                if kw.arg == "name" and isinstance(kw.value, ast.Constant):
+                    name = kw.value.value
+                elif kw.arg == "aliases" and isinstance(kw.value, (ast.List, ast.Tuple)):
+                    names.extend(e.value for e in kw.value.elts if isinstance(e, ast.Constant))
+            names.append(name)
+    return names
+
+
+def _register_lazy(bot, ext: str, result: ExtensionLoadResult) -> List[str]:
+    """Register stub commands that load ``ext`` on first use and then re-dispatch.
+
+    If the load fails the stubs are put back, so the next use tries again,
+    and the error is recorded on ``result``.
+    """
+    names = _command_names(ext)
+    lock = asyncio.Lock()
+    registered = []
+
+    async def _load_on_first_use(ctx: commands.Context, *, _args: str = ""):
+        async with lock:
+            if ext not in bot.extensions:
+                # the cog's own commands can't be added while the stubs hold their names
+                for name in registered:
+                    bot.remove_command(name)
+                start = time.perf_counter()
+                try:
+                    await bot.load_extension(ext)
+                except Exception as e:
+                    result.setup_seconds = time.perf_counter() - start
+                    result.error = repr(e)
+                    for name in registered:
+                        bot.add_command(commands.Command(_load_on_first_use, name=name, hidden=True))
+                    logger.exception(f"❌ Failed to lazily load extension {ext}: {e}")
+                    await ctx.send("❌ This feature failed to load, please try again later.")
+                    return
+                result.setup_seconds = time.perf_counter() - start
+                result.error = None
+                logger.info("Lazily loaded extension %s in %.3fs", ext, result.setup_seconds)
+        new_ctx = await bot.get_context(ctx.message)
+        await bot.invoke(new_ctx)
+
+    for name in names:
+        if bot.get_command(name) is not None:
+            logger.warning("Lazy command %s for %s clashes with a loaded command", name, ext)
+            continue
+        bot.add_command(commands.Command(_load_on_first_use, name=name, hidden=True))
+        registered.append(name)
+    return registered
+
+
+async def load_feature_extensions(bot, lazy: Optional[Iterable[str]] = None) -> LoadReport:
+    """Load all feature cogs, importing their dependencies concurrently.
+
+    Extensions named in ``lazy`` (feature names such as ``random_idea``) are
+    only registered by their command names and imported on first use. Lazy
+    loading is meant for command-only features; cogs that start background
+    tasks should stay eager.
+    """
+    lazy = set(settings.lazy_extensions if lazy is None else lazy)
+    report = LoadReport()
+    start = time.perf_counter()
+
+    eager = []
     for ext in iter_feature_extensions():
+        if _feature_name(ext) in lazy:
+            result = ExtensionLoadResult(ext, lazy=True)
+            registered = _register_lazy(bot, ext, result)
+            report.results.append(result)
+            logger.info(f"💤 Deferred extension: {ext} (commands: {', '.join(registered)})")
+        else:
+            eager.append(ext)
+
+    # File reads and C-extension initialisation overlap across threads, so heavy imports run side by side
+    loop = asyncio.get_running_loop()
+    with ThreadPoolExecutor(max_workers=max(1, len(eager)), thread_name_prefix="ext-import") as pool:
+        import_times = await asyncio.gather(
+            *(loop.run_in_executor(pool, _prewarm, ext) for ext in eager)
+        )
+
+    # setup() touches the bot, so it runs on the loop once the heavy imports are cached
+    for ext, import_seconds in zip(eager, import_times):
+        result = ExtensionLoadResult(ext, import_seconds=import_seconds)
+        setup_start = time.perf_counter()
         try:
             await bot.load_extension(ext)
-            logger.info(f"✅ Loaded extension: {ext}")
+            result.setup_seconds = time.perf_counter() - setup_start
+            logger.info(
+                f"✅ Loaded extension: {ext} "
+                f"(imports {result.import_seconds:.3f}s, setup {result.setup_seconds:.3f}s)"
+            )
         except Exception as e:
+            result.setup_seconds = time.perf_counter() - setup_start
+            result.error = repr(e)
             logger.exception(f"❌ Failed to load extension {ext}: {e}")
+        report.results.append(result)
+
+    report.total_seconds = time.perf_counter() - start
+    target = settings.cold_start_target_seconds
+    if target and report.total_seconds > target:
+        logger.warning(
+            "Extension loading took %.2fs, over the %.2fs cold start target",
+            report.total_seconds, target,
+        )
+    else:
+        logger.info("Loaded %d extensions in %.2fs", len(report.results), report.total_seconds)
+
+    bot.extension_load_report = report
+    return report
@@ -0,0 +1,151 @@
+import logging
+import os
+import sys
+import tracemalloc
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Tuple
+
+import discord
+
+from bot.config import settings
+
+logger = logging.getLogger(__name__)
+
+# frames kept per allocation; enough to see which cog a library allocation was made for
+TRACE_FRAMES = 10
+
+
+@dataclass
+class Budget:
+    subsystem: str
+    limit: int
+    measure: Callable[[], int]
+
+    @property
+    def used(self) -> int:
+        try:
+            return self.measure()
+        except Exception:
+            logger.exception("Measuring memory for %s failed", self.subsystem)
+            return 0
+
+    @property
+    def exceeded(self) -> bool:
+        return self.used > self.limit
+
+
+class BudgetRegistry:
+    """Per-subsystem memory budgets. Each subsystem measures and enforces its own."""
+
+    def __init__(self):
+        self.budgets: Dict[str, Budget] = {}
+
+    def register(self, subsystem: str, normal: int, low: int, measure: Callable[[], int]) -> Budget:
+        """Register (or replace, on cog reload) a budget; the limit depends on the memory profile."""
+        budget = Budget(subsystem, low if settings.low_memory else normal, measure)
+        self.budgets[subsystem] = budget
+        return budget
+
+
+budgets = BudgetRegistry()
+
+
+def client_options(intents: discord.Intents) -> dict:
+    """discord.py cache settings for the configured memory profile."""
+    options = {"max_messages": settings.max_messages}
+    # discord.py refuses to chunk without the members intent, so only pass it along when that's on
+    if intents.members:
+        options["chunk_guilds_at_startup"] = settings.chunk_guilds_at_startup
+    if settings.low_memory:
+        # only members in voice stay cached, which is all !record needs
+        options["member_cache_flags"] = discord.MemberCacheFlags(voice=True, joined=False)
+    return options
+
+
+def deep_sizeof(obj, _seen=None) -> int:
+    """Approximate size of a tree of builtin containers, counting shared objects once."""
+    seen = _seen if _seen is not None else set()
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        size += sum(deep_sizeof(k, seen) + deep_sizeof(v, seen) for k, v in obj.items())
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        size += sum(deep_sizeof(item, seen) for item in obj)
+    return size
+
+
+def rss_bytes() -> Optional[int]:
+    """Current resident set size, or None where it can't be read cheaply."""
+    try:
+        with open("/proc/self/statm", "r") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        return None
+
+
+def discord_cache_stats(bot) -> Dict[str, int]:
+    return {
+        "guilds": len(bot.guilds),
+        "members": sum(len(g.members) for g in bot.guilds),
+        "users": len(bot.users),
+        "messages": len(bot.cached_messages),
+    }
+
+
+def start_tracing() -> None:
+    if not tracemalloc.is_tracing():
+        tracemalloc.start(TRACE_FRAMES)
+        logger.info("tracemalloc started with %d frames", TRACE_FRAMES)
+
+
+def stop_tracing() -> None:
+    if tracemalloc.is_tracing():
+        tracemalloc.stop()
+        logger.info("tracemalloc stopped")
+
+
+def _frame_subsystem(filename: str) -> Optional[str]:
+    parts = filename.replace("\\", "/").split("/")
+    for i in range(len(parts) - 2):
+        if parts[i] == "bot" and parts[i + 1] == "features":
+            return parts[i + 2]
+        if parts[i] == "bot" and parts[i + 1] == "core":
+            return "core." + os.path.splitext(parts[i + 2])[0]
+    return None
+
+
+def _library(filename: str) -> str:
+    parts = filename.replace("\\", "/").split("/")
+    if "site-packages" in parts:
+        idx = parts.index("site-packages")
+        if idx + 1 < len(parts):
+            return os.path.splitext(parts[idx + 1])[0]
+    return "python"
+
+
+def subsystem_breakdown(limit: int = 10) -> List[Tuple[str, int]]:
+    """Traced memory grouped by the bot subsystem that caused each allocation.
+
+    An allocation belongs to the innermost cog or core module in its
+    traceback (so a job handler counts for its feature, not the scheduler
+    that called it), otherwise to the library that made it.
+    """
+    if not tracemalloc.is_tracing():
+        return []
+    snapshot = tracemalloc.take_snapshot().filter_traces((
+        tracemalloc.Filter(False, tracemalloc.__file__),
+    ))
+    totals: Dict[str, int] = {}
+    for stat in snapshot.statistics("traceback"):
+        owner = None
+        # tracebacks run oldest frame first
+        for frame in reversed(stat.traceback):
+            owner = _frame_subsystem(frame.filename)
+            if owner:
+                break
+        if owner is None:
+            owner = _library(stat.traceback[-1].filename)
+        totals[owner] = totals.get(owner, 0) + stat.size
+    return sorted(totals.items(), key=lambda item: item[1], reverse=True)[:limit]
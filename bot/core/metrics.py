@@ -0,0 +1,198 @@
+import asyncio
+import bisect
+import logging
+import sys
+import threading
+import time
+import traceback
+from contextlib import contextmanager
+from typing import Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Upper bounds in seconds, Prometheus style
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+
+class Histogram:
+    """Fixed-bucket latency histogram with approximate quantiles."""
+
+    def __init__(self, buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # last slot is +Inf
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+        self.errors = 0
+
+    def observe(self, value: float, error: bool = False) -> None:
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+        self.max = max(self.max, value)
+        if error:
+            self.errors += 1
+
+    def quantile(self, q: float) -> float:
+        """Return the upper bound of the bucket holding the q-th observation."""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for i, n in enumerate(self.counts):
+            seen += n
+            if seen >= rank:
+                return min(self.buckets[i], self.max) if i < len(self.buckets) else self.max
+        return self.max
+
+    @property
+    def mean(self) -> float:
+        return self.sum / self.count if self.count else 0.0
+
+
+class MetricsRegistry:
+    """Holds command, dependency and event-loop lag histograms for the process."""
+
+    def __init__(self):
+        self.commands: Dict[str, Histogram] = {}
+        self.dependencies: Dict[str, Histogram] = {}
+        self.loop_lag = Histogram()
+        self.stalls = 0
+        self.started_at = time.time()
+
+    def observe_command(self, name: str, seconds: float, error: bool = False) -> None:
+        self.commands.setdefault(name, Histogram()).observe(seconds, error)
+
+    def observe_dependency(self, name: str, seconds: float, error: bool = False) -> None:
+        self.dependencies.setdefault(name, Histogram()).observe(seconds, error)
+
+    @contextmanager
+    def timer(self, dependency: str):
+        """Time a call to an external dependency. Works around sync and async code alike."""
+        start = time.perf_counter()
+        error = False
+        try:
+            yield
+        except BaseException:
+            error = True
+            raise
+        finally:
+            self.observe_dependency(dependency, time.perf_counter() - start, error)
+
+    def render_prometheus(self) -> str:
+        """Render all histograms in the Prometheus text exposition format."""
+        lines: List[str] = []
+        _render_family(lines, "utilitybot_command_seconds", "command", self.commands)
+        _render_family(lines, "utilitybot_dependency_seconds", "dependency", self.dependencies)
+        _render_family(lines, "utilitybot_loop_lag_seconds", None, {"": self.loop_lag})
+        lines.append("# TYPE utilitybot_loop_stalls_total counter")
+        lines.append(f"utilitybot_loop_stalls_total {self.stalls}")
+        return "\n".join(lines) + "\n"
+
+
+def _render_family(lines: List[str], metric: str, label: Optional[str], hists: Dict[str, Histogram]) -> None:
+    lines.append(f"# TYPE {metric} histogram")
+    for key, hist in sorted(hists.items()):
+        base = f'{label}="{key}"' if label else ""
+        sep = "," if base else ""
+        cumulative = 0
+        for bound, n in zip(hist.buckets, hist.counts):
+            cumulative += n
+            lines.append(f'{metric}_bucket{{{base}{sep}le="{bound}"}} {cumulative}')
+        lines.append(f'{metric}_bucket{{{base}{sep}le="+Inf"}} {hist.count}')
+        suffix = f"{{{base}}}" if base else ""
+        lines.append(f"{metric}_sum{suffix} {hist.sum:.6f}")
+        lines.append(f"{metric}_count{suffix} {hist.count}")
+        if label:
+            lines.append(f"{metric}_errors_total{suffix} {hist.errors}")
+
+
+metrics = MetricsRegistry()
+
+
+def install_command_hooks(bot) -> None:
+    """Record per-command latency through the bot's global before/after invoke hooks."""
+
+    @bot.before_invoke
+    async def _start_timer(ctx):
+        ctx.metrics_started = time.perf_counter()
+
+    @bot.after_invoke
+    async def _stop_timer(ctx):
+        started = getattr(ctx, "metrics_started", None)
+        if started is None or ctx.command is None:
+            return
+        metrics.observe_command(
+            ctx.command.qualified_name, time.perf_counter() - started, error=ctx.command_failed
+        )
+
+
+class LoopLagMonitor:
+    """Samples event-loop lag and logs the loop thread's stack when it stalls.
+
+    A coroutine on the loop records a heartbeat every ``interval`` seconds and
+    measures how late it woke up. A watchdog thread checks the heartbeat; if
+    it is more than ``threshold`` overdue the loop is blocked, so the watchdog
+    dumps whatever the loop thread is executing at that moment.
+    """
+
+    def __init__(self, interval: float = 0.1, threshold: float = 0.25, registry: MetricsRegistry = metrics):
+        self.interval = interval
+        self.threshold = threshold
+        self.registry = registry
+        self._heartbeat = time.monotonic()
+        self._loop_thread_id: Optional[int] = None
+        self._task: Optional[asyncio.Task] = None
+        self._stop = threading.Event()
+        self._watchdog: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        self._loop_thread_id = threading.get_ident()
+        self._heartbeat = time.monotonic()
+        self._task = asyncio.get_running_loop().create_task(self._sample())
+        self._watchdog = threading.Thread(target=self._watch, name="loop-lag-watchdog", daemon=True)
+        self._watchdog.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._task is not None:
+            self._task.cancel()
+
+    async def _sample(self) -> None:
+        while True:
+            expected = time.monotonic() + self.interval
+            await asyncio.sleep(self.interval)
+            now = time.monotonic()
+            self._heartbeat = now
+            self.registry.loop_lag.observe(max(0.0, now - expected))
+
+    def _watch(self) -> None:
+        reported_beat = None
+        while not self._stop.wait(self.threshold / 2):
+            beat = self._heartbeat
+            # the sampler sleeps for ``interval`` between beats, so only time past that is lag
+            blocked_for = time.monotonic() - beat - self.interval
+            if blocked_for < self.threshold or beat == reported_beat:
+                continue
+            # One report per stall, taken while the loop is still blocked
+            reported_beat = beat
+            self.registry.stalls += 1
+            frame = sys._current_frames().get(self._loop_thread_id)
+            stack = "".join(traceback.format_stack(frame)) if frame else "<no frame>"
+            logger.warning("Event loop blocked for %.3fs, loop thread stack:\n%s", blocked_for, stack)
+
+
+async def start_metrics_server(port: int, host: str = "127.0.0.1"):
+    """Serve ``/metrics`` in Prometheus text format on a local port. Returns the runner."""
+    from aiohttp import web
+
+    async def handle(request):
+        return web.Response(text=metrics.render_prometheus(), content_type="text/plain")
+
+    app = web.Application()
+    app.router.add_get("/metrics", handle)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    await web.TCPSite(runner, host, port).start()
+    logger.info("Metrics endpoint listening on http://%s:%d/metrics", host, port)
+    return runner
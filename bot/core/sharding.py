@@ -0,0 +1,228 @@
+import asyncio
+import glob
+import json
+import logging
+import multiprocessing
+import os
+import time
+from typing import Callable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+def shard_ranges(shard_count: int, workers: int) -> List[List[int]]:
+    """Split shard ids 0..shard_count-1 into ``workers`` contiguous, near-equal ranges."""
+    workers = max(1, min(workers, shard_count))
+    base, extra = divmod(shard_count, workers)
+    ranges, start = [], 0
+    for i in range(workers):
+        size = base + (1 if i < extra else 0)
+        ranges.append(list(range(start, start + size)))
+        start += size
+    return ranges
+
+
+class LeaderElection:
+    """Elects one worker process by holding an exclusive lock on a shared file.
+
+    The OS drops the lock when the holder exits, so another worker picks it
+    up on its next attempt. Singleton jobs (feed polling, scheduled
+    generation) check ``is_leader`` before doing any work.
+    """
+
+    def __init__(self, path: str, worker_index: int):
+        self.path = path
+        self.worker_index = worker_index
+        self._file = None
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def is_leader(self) -> bool:
+        return self._file is not None
+
+    def try_acquire(self) -> bool:
+        if self._file is not None:
+            return True
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        f = open(self.path, "a+")
+        try:
+            _lock(f)
+        except OSError:
+            f.close()
+            return False
+        f.seek(0)
+        f.truncate()
+        f.write(f"{os.getpid()} worker-{self.worker_index}\n")
+        f.flush()
+        self._file = f
+        logger.info("Worker %d elected leader for singleton jobs", self.worker_index)
+        return True
+
+    def start(self, interval: float = 5.0) -> None:
+        async def campaign():
+            while not self.try_acquire():
+                await asyncio.sleep(interval)
+
+        self._task = asyncio.get_running_loop().create_task(campaign())
+
+    def release(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+if os.name == "nt":
+    import msvcrt
+
+    def _lock(f):
+        f.seek(0)
+        msvcrt.locking(f.fileno(), msvcrt.LK_NBLCK, 1)
+else:
+    import fcntl
+
+    def _lock(f):
+        fcntl.flock(f.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+
+
+def is_leader(bot) -> bool:
+    """True when this process should run singleton jobs. Always true without sharding workers."""
+    election = getattr(bot, "leader_election", None)
+    return election is None or election.is_leader
+
+
+def _health_path(run_dir: str, worker_index: int) -> str:
+    return os.path.join(run_dir, "shards", f"worker-{worker_index}.json")
+
+
+def shard_health(bot, worker_index: int = 0) -> dict:
+    """Snapshot of this process's shards: gateway latency, connection state and guild counts."""
+    guild_counts = {}
+    for guild in bot.guilds:
+        guild_counts[guild.shard_id] = guild_counts.get(guild.shard_id, 0) + 1
+
+    shards = []
+    for shard_id, shard in sorted(getattr(bot, "shards", {}).items()):
+        shards.append({
+            "id": shard_id,
+            "latency": shard.latency,
+            "closed": shard.is_closed(),
+            "ratelimited": shard.is_ws_ratelimited(),
+            "guilds": guild_counts.get(shard_id, 0),
+        })
+    if not shards:
+        shards.append({
+            "id": 0,
+            "latency": bot.latency,
+            "closed": bot.is_closed(),
+            "ratelimited": bot.is_ws_ratelimited(),
+            "guilds": len(bot.guilds),
+        })
+    return {
+        "worker": worker_index,
+        "pid": os.getpid(),
+        "leader": is_leader(bot),
+        "updated": time.time(),
+        "shards": shards,
+    }
+
+
+async def report_shard_health(bot, run_dir: str, worker_index: int, interval: float = 30.0) -> None:
+    """Periodically log and write this worker's shard health so any worker can report on all of them."""
+    path = _health_path(run_dir, worker_index)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    await bot.wait_until_ready()
+    while not bot.is_closed():
+        health = shard_health(bot, worker_index)
+        tmp = path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(health, f)
+        os.replace(tmp, path)
+        for shard in health["shards"]:
+            logger.info(
+                "Shard %d: latency %.0fms, %d guilds%s",
+                shard["id"], shard["latency"] * 1000, shard["guilds"], " (closed)" if shard["closed"] else "",
+            )
+        await asyncio.sleep(interval)
+
+
+def read_shard_health(run_dir: str) -> List[dict]:
+    """Load the latest health snapshot written by every worker."""
+    reports = []
+    for path in sorted(glob.glob(os.path.join(run_dir, "shards", "worker-*.json"))):
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                reports.append(json.load(f))
+        except (OSError, ValueError):
+            continue
+    return reports
+
+
+def launch_workers(
+    target: Callable, shard_count: int, workers: int, restart_delay: float = 5.0,
+    fast_fail_seconds: float = 30.0, max_fast_failures: int = 5,
+) -> None:
+    """Run ``target(worker_index, shard_ids, shard_count)`` in one process per shard range.
+
+    Workers that crash are restarted with the same shard range, after
+    ``restart_delay`` seconds doubled for every consecutive crash within
+    ``fast_fail_seconds`` of starting. A worker that exits cleanly, or fails
+    fast ``max_fast_failures`` times in a row (a bad token or config), is
+    not restarted. Blocks until interrupted or no workers are left.
+    """
+    ctx = multiprocessing.get_context("spawn")
+    ranges = shard_ranges(shard_count, workers)
+    procs = {}
+    started = {}
+    fast_failures = {index: 0 for index in range(len(ranges))}
+    restart_at = {}  # worker index -> monotonic deadline for its restart
+
+    def spawn(index: int):
+        proc = ctx.Process(
+            target=target,
+            args=(index, ranges[index], shard_count),
+            name=f"utilitybot-worker-{index}",
+        )
+        proc.start()
+        procs[index] = proc
+        started[index] = time.monotonic()
+        logger.info("Started worker %d (pid %s) for shards %s", index, proc.pid, ranges[index])
+
+    for index in range(len(ranges)):
+        spawn(index)
+
+    try:
+        while procs or restart_at:
+            time.sleep(1)
+            now = time.monotonic()
+            for index, deadline in list(restart_at.items()):
+                if now >= deadline:
+                    del restart_at[index]
+                    spawn(index)
+            for index, proc in list(procs.items()):
+                if proc.is_alive():
+                    continue
+                del procs[index]
+                if proc.exitcode == 0:
+                    logger.info("Worker %d exited cleanly, not restarting it", index)
+                    continue
+                fast_failures[index] = fast_failures[index] + 1 if now - started[index] < fast_fail_seconds else 0
+                if fast_failures[index] >= max_fast_failures:
+                    logger.error(
+                        "Worker %d failed %d times right after starting (last exit code %s), giving up on it",
+                        index, fast_failures[index], proc.exitcode,
+                    )
+                    continue
+                delay = restart_delay * 2 ** max(0, fast_failures[index] - 1)
+                logger.warning("Worker %d exited with code %s, restarting in %.0fs", index, proc.exitcode, delay)
+                restart_at[index] = now + delay
+        logger.warning("No workers left running")
+    except KeyboardInterrupt:
+        logger.info("Stopping %d workers", len(procs))
+    finally:
+        for proc in procs.values():
+            if proc.is_alive():
+                proc.terminate()
+        for proc in procs.values():
+            proc.join(timeout=10)
@@ -1,24 +1,122 @@
 from urllib import request
 from discord.ext import tasks, commands
-import requests
 import aiohttp
+import asyncio
 import xml.etree.ElementTree as ET
 import json
 import re
 import os
 import json
+import logging
 
+from bot.config import settings
+from bot.core.jobs import FAILED, get_scheduler
+from bot.core.llm import Priority, get_llm_gateway
+from bot.core.logging import rate_limited_logger
+from bot.core.memory import budgets, deep_sizeof
+from bot.core.metrics import metrics
+from bot.core.sharding import is_leader
+from bot.features.auto_pr_review.graphql import GitHubGraphQL, GraphQLError, split_diff
+
+
+logger = logging.getLogger(__name__)
+# feed errors repeat every minute for every tracked repo while GitHub is down
+feed_logger = rate_limited_logger(f"{__name__}.feeds", interval=300, burst=3)
 
 DEEPSEEK_API_KEY = os.getenv("DEEPSEEK_API_KEY")  # Deep Seek API
 MAX_LINES = 50  # Limit of max diff changes sent to the deepseek API to save tokens
 MAX_TOKEN = 150  # Limit for token usage
+REVIEW_MAX_FILES = 4  # files reviewed per PR, one LLM call each
+REVIEW_CONCURRENCY = 4  # per-file calls in flight at once (LLM_FEATURE_LIMITS also applies)
+REVIEW_TOKEN_BUDGET = 4000  # rough prompt tokens shared by all reviewed files
+MAX_LINE_CHARS = 300  # longer changed lines (minified, generated) are cut to this
+FILES_PER_PAGE = 100
+MAX_FILE_PAGES = 30  # GitHub lists at most 3000 files per PR
+FEEDS_BUDGET = 1024 * 1024  # tracked_feeds, roughly 400 bytes per repo
+FEEDS_BUDGET_LOW = 128 * 1024
 STORAGE_PATH = os.path.join(os.path.dirname(__file__), "tracked_repos.json")
 
+# Path fragments for files that are not worth sending to the AI
+IGNORE_PATTERNS = {
+    ".md",
+    ".git",
+    "LICENSE",
+    ".txt",
+    ".env",
+    "mock",
+    "test_data",
+    "sample_data",
+    ".png",
+    ".jpg",
+    ".jpeg",
+    ".gif",
+    ".pdf",
+    ".zip",
+    ".exe",
+    ".dll",
+    ".bin",
+    ".csv",
+    ".mp3",
+    ".mp4",
+}
+
+# How much a changed line counts when picking which files to review
+LANGUAGE_WEIGHTS = {
+    ".py": 1.0,
+    ".c": 1.0,
+    ".cpp": 1.0,
+    ".h": 1.0,
+    ".hpp": 1.0,
+    ".ino": 1.0,
+    ".rs": 1.0,
+    ".go": 1.0,
+    ".java": 1.0,
+    ".kt": 1.0,
+    ".ts": 0.9,
+    ".tsx": 0.9,
+    ".js": 0.8,
+    ".jsx": 0.8,
+    ".sh": 0.6,
+    ".yml": 0.4,
+    ".yaml": 0.4,
+    ".toml": 0.4,
+    ".html": 0.4,
+    ".css": 0.3,
+    ".json": 0.3,
+}
+DEFAULT_LANGUAGE_WEIGHT = 0.5
+
 
 GITHUB_PAT = os.getenv(
     "GITHUB_PAT"
 )  # github pat is needed to make requests to GitHub API
 
+GITHUB_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_8_2) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/29.0.1521.3 Safari/537.36",
+}
+if GITHUB_PAT:
+    GITHUB_HEADERS["Authorization"] = f"token {GITHUB_PAT}"
+
+
+def split_message(text, limit=1900):
+    """Split text on line boundaries into pieces that fit in one Discord message."""
+    chunks, current = [], ""
+    for line in text.split("\n"):
+        while len(line) > limit:
+            if current:
+                chunks.append(current)
+                current = ""
+            chunks.append(line[:limit])
+            line = line[limit:]
+        if current and len(current) + len(line) + 1 > limit:
+            chunks.append(current)
+            current = line
+        else:
+            current = f"{current}\n{line}" if current else line
+    if current:
+        chunks.append(current)
+    return chunks
+
 
 class AutoPRReviewCog(commands.Cog):
     """Auto PR Review Assistant feature placeholder implementation."""
@@ -26,81 +124,41 @@ class AutoPRReviewCog(commands.Cog):
     def __init__(self, bot: commands.Bot):
         self.bot = bot
         self.tracked_feeds = {}
+        self.session = None
+        # GraphQL batches all tracked repos into one request, but always needs a token
+        self.graphql = None
+        if settings.github_graphql:
+            if GITHUB_PAT:
+                self.graphql = GitHubGraphQL(self.get_session, GITHUB_PAT)
+            else:
+                logger.warning("GITHUB_GRAPHQL is set without GITHUB_PAT, using the REST API")
         self.load_tracked_feeds()
+        self.feeds_budget = budgets.register(
+            "auto_pr_review", FEEDS_BUDGET, FEEDS_BUDGET_LOW, lambda: deep_sizeof(self.tracked_feeds)
+        )
+        # commit reviews are queued as background jobs so a slow LLM never holds up the feed loop
+        get_scheduler().register("auto_pr_review.commit_review", self.review_commit, on_done=self.post_commit_review)
         self.poll_atom_feeds.start()
 
-    # method that returns files to ignore when putting it into ai
-    def ignore_files(self, repo):
+    async def cog_unload(self):
+        self.poll_atom_feeds.cancel()
+        if self.session is not None:
+            await self.session.close()
 
-        raw_response = requests.get(
-            f"https://api.github.com/repos/Electrium-Mobility/{repo}/git/trees/main?recursive=1",
-            headers={
-                "Authorization": f"token {GITHUB_PAT}",
-                "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_8_2) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/29.0.1521.3 Safari/537.36",
-            },
-        )
+    # one pooled session for every GitHub request made by this cog
+    def get_session(self):
+        if self.session is None or self.session.closed:
+            self.session = aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=30))
+        return self.session
 
-        if raw_response.status_code != 200:
-            print(f"Error: {raw_response.status_code}")
-            return
-
-        response_json = raw_response.json()
-
-        paths = [item["path"] for item in response_json["tree"]]
-
-        ignore_patterns = {
-            ".md",
-            ".git",
-            "LICENSE",
-            ".txt",
-            ".env",
-            "mock",
-            "test_data",
-            "sample_data",
-            ".png",
-            ".jpg",
-            ".jpeg",
-            ".gif",
-            ".pdf",
-            ".zip",
-            ".exe",
-            ".dll",
-            ".bin",
-            ".csv",
-            ".mp3",
-            ".mp4",
-        }
-
-        ignore_files = [
+    # method that returns the paths matching one of IGNORE_PATTERNS
+    def filter_ignored_paths(self, paths):
+        return [
             path
             for path in paths
-            if any(pattern in path for pattern in ignore_patterns)
+            if any(pattern in path for pattern in IGNORE_PATTERNS)
         ]
 
-        return ignore_files
-
-    # method to get number of additions and deletions
-    def commit_information(self, repo, commit_sha):
-        raw_response = requests.get(
-            f"https://api.github.com/repos/Electrium-Mobility/{repo}/commits/{commit_sha}",
-            headers={
-                "Authorization": f"token {GITHUB_PAT}",
-                "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_8_2) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/29.0.1521.3 Safari/537.36",
-            },
-        )
-
-        if raw_response.status_code != 200:
-            print(f"Error: {raw_response.status_code}")
-            return
-
-        parse_response = raw_response.json()
-
-        deleted_lines = parse_response["stats"]["deletions"]
-        added_lines = parse_response["stats"]["additions"]
-
-        print(f"Total Number of Deletions are {deleted_lines}.")
-        print(f"Total Number of Additions are {added_lines}.")
-
     # method to remove unimportant lines from diff changes
     def filter_lines(self, lines):
         ignore_prefixes = ("import ", "from ", "#", "'''", '"""')
@@ -128,15 +186,35 @@ class AutoPRReviewCog(commands.Cog):
             self.filter_lines(removed_lines)[:MAX_LINES],
         ]
 
-    def analyze_with_deepseek(self, changes):
+    # method to trim added/removed lines to roughly max_tokens (about 4 characters per token)
+    def budget_changes(self, changes, max_tokens):
+        budget = max_tokens * 4
+        kept = [[], []]
+        # alternate sides so a large addition doesn't crowd out every removed line
+        for i in range(max(len(changes[0]), len(changes[1]))):
+            for side in (0, 1):
+                if i >= len(changes[side]):
+                    continue
+                line = changes[side][i]
+                if len(line) > MAX_LINE_CHARS:
+                    line = line[:MAX_LINE_CHARS] + " …"
+                if len(line) >= budget:
+                    continue  # shorter lines further down may still fit
+                budget -= len(line) + 1
+                kept[side].append(line)
+        return kept
+
+    async def analyze_with_deepseek(self, changes, priority=Priority.INTERACTIVE, filename=None):
         added_lines = changes[0]
         removed_lines = changes[1]
 
         if not DEEPSEEK_API_KEY:
             return -1
         try:
+            file_note = f"The changes below are all from `{filename}`." if filename else ""
             prompt = f"""
                 You are an experienced senior software engineer performing an code review.
+                {file_note}
 
                 Each section shows the removed and added code extracted from the diff.
 
@@ -171,36 +249,121 @@ class AutoPRReviewCog(commands.Cog):
                 - No validation for missing environment variables
             """
 
-            response = requests.post(
-                "https://api.deepseek.com/v1/chat/completions",
-                headers={"Authorization": f"Bearer {DEEPSEEK_API_KEY}"},
-                json={
-                    "model": "deepseek-coder",
-                    "messages": [
-                        {
-                            "role": "system",
-                            "content": "You are an experienced code reviewer analyzing Git diffs.",
-                        },
-                        {"role": "user", "content": prompt},
-                    ],
-                    "max_tokens": MAX_TOKEN,
-                },
-                timeout=30,
+            return await get_llm_gateway().chat(
+                [
+                    {
+                        "role": "system",
+                        "content": "You are an experienced code reviewer analyzing Git diffs.",
+                    },
+                    {"role": "user", "content": prompt},
+                ],
+                feature="auto_pr_review",
+                model="deepseek-coder",
+                max_tokens=MAX_TOKEN,
+                priority=priority,
             )
-
-            data = response.json()
-            return data["choices"][0]["message"]["content"].strip()
         except Exception as e:
             return f"Error with deepseek: {e}"
 
-    def analyze_diff(self, url):
-        diffResponse = requests.get(
-            url, headers={"Accept": "application/vnd.github.v3.diff"}
-        )
+    async def fetch_diff(self, url):
+        with metrics.timer("github"):
+            async with self.get_session().get(
+                url, headers={**GITHUB_HEADERS, "Accept": "application/vnd.github.v3.diff"}
+            ) as diffResponse:
+                return await diffResponse.text()
 
-        diff_text = diffResponse.text
+    async def analyze_diff(self, url, priority=Priority.INTERACTIVE):
+        diff_text = await self.fetch_diff(url)
         diff_changes = self.extract_changes(diff_text)
-        return self.analyze_with_deepseek(diff_changes)
+        return await self.analyze_with_deepseek(diff_changes, priority)
+
+    # method to list every changed file of a PR, following GitHub's pagination
+    async def fetch_pr_files(self, project, number):
+        url = f"{settings.github_api_url}/repos/Electrium-Mobility/{project}/pulls/{number}/files"
+        files = []
+        for page in range(1, MAX_FILE_PAGES + 1):
+            with metrics.timer("github"):
+                async with self.get_session().get(
+                    url, params={"per_page": FILES_PER_PAGE, "page": page}, headers=GITHUB_HEADERS
+                ) as response:
+                    if response.status != 200:
+                        logger.warning("Failed to list files for %s#%s: HTTP %s", project, number, response.status)
+                        break
+                    batch = await response.json()
+            files.extend(batch)
+            if len(batch) < FILES_PER_PAGE:
+                break
+        return files
+
+    # method to order reviewable files by weighted change size, biggest first
+    def rank_files(self, files):
+        ignored = set(self.filter_ignored_paths([f["filename"] for f in files]))
+        ranked = []
+        for f in files:
+            # no patch means a binary file or a diff too large for GitHub to inline
+            if f["filename"] in ignored or not f.get("patch"):
+                continue
+            ext = os.path.splitext(f["filename"])[1].lower()
+            ranked.append((f.get("changes", 0) * LANGUAGE_WEIGHTS.get(ext, DEFAULT_LANGUAGE_WEIGHT), f))
+        ranked.sort(key=lambda item: item[0], reverse=True)
+        return [f for _, f in ranked]
+
+    # method to review the top files in parallel and merge the results into one message
+    async def review_pr_files(self, files, priority=Priority.INTERACTIVE):
+        ranked = self.rank_files(files)
+        selected = ranked[:REVIEW_MAX_FILES]
+        if not selected:
+            return "No reviewable files in this PR."
+
+        per_file_tokens = REVIEW_TOKEN_BUDGET // len(selected)
+        gate = asyncio.Semaphore(REVIEW_CONCURRENCY)
+
+        async def review(f):
+            changes = self.budget_changes(self.extract_changes(f["patch"]), per_file_tokens)
+            async with gate:
+                return await self.analyze_with_deepseek(changes, priority, filename=f["filename"])
+
+        reviews = await asyncio.gather(*(review(f) for f in selected))
+        if any(isinstance(r, int) for r in reviews):  # -1 returned when API key missing
+            return -1
+
+        sections = []
+        for f, text in zip(selected, reviews):
+            sections.append(f"📄 `{f['filename']}` (+{f.get('additions', 0)}/-{f.get('deletions', 0)})\n{text.strip()}")
+        if len(ranked) > len(selected):
+            sections.append(f"_{len(ranked) - len(selected)} smaller files not reviewed._")
+        return "\n\n".join(sections)
+
+    # method to get PR details and changed files, via GraphQL when enabled
+    async def fetch_pull_request(self, project, number, pr_api_url):
+        if self.graphql is not None:
+            try:
+                # metadata and file stats in one query, every file's patch from one diff request
+                (details, files), diff_text = await asyncio.gather(
+                    self.graphql.pull_request(project, int(number), max_wait=0),
+                    self.fetch_diff(pr_api_url),
+                )
+                if details is None:
+                    return 404, None, []
+                patches = split_diff(diff_text)
+                for f in files:
+                    if f["filename"] in patches:
+                        f["patch"] = patches[f["filename"]]
+                return 200, details, files
+            except (GraphQLError, aiohttp.ClientError, asyncio.TimeoutError) as e:
+                # REST has its own quota, so it still works when the GraphQL budget is spent
+                logger.warning("GraphQL PR lookup failed, using REST: %s", e)
+
+        async def fetch_details():
+            with metrics.timer("github"):
+                async with self.get_session().get(pr_api_url, headers=GITHUB_HEADERS) as response:
+                    return response.status, (await response.json() if response.status == 200 else None)
+
+        # PR details and the file list don't depend on each other
+        (status, details), files = await asyncio.gather(
+            fetch_details(), self.fetch_pr_files(project, number)
+        )
+        return status, details, files
 
     @commands.command(name="prreview")
     @commands.cooldown(
@@ -209,8 +372,7 @@ class AutoPRReviewCog(commands.Cog):
     async def prreview(self, ctx: commands.Context, *, pr_link: str):
         """Placeholder command: accept a PR link and return a placeholder response."""
 
-        print("prreview command called")
-        print(f"Received PR link: {pr_link}")
+        logger.debug("prreview command called with %s", pr_link)
 
         pattern = r"https://github.com/Electrium-Mobility/([^/]+)/pull/(\d+)"
         match = re.match(pattern, pr_link)
@@ -222,21 +384,20 @@ class AutoPRReviewCog(commands.Cog):
 
         project, pullNumber = match.groups()
 
-        response = requests.get(
-            f"https://api.github.com/repos/Electrium-Mobility/{project}/pulls/{pullNumber}"
-        )
+        pr_api_url = f"{settings.github_api_url}/repos/Electrium-Mobility/{project}/pulls/{pullNumber}"
+        status, responseJson, files = await self.fetch_pull_request(project, pullNumber, pr_api_url)
 
-        if response.status_code != 200:
+        if status != 200:
             await ctx.send(
                 f"Failed to fetch PR details, Please try again different PR link"
             )
         else:
-            responseJson = response.json()
+            if files:
+                deepseek_response = await self.review_pr_files(files)
+            else:
+                # file listing failed, fall back to a single review of the flattened diff
+                deepseek_response = await self.analyze_diff(pr_api_url)
 
-            deepseek_response = self.analyze_diff(
-                f"https://api.github.com/repos/Electrium-Mobility/{project}/pulls/{pullNumber}"
-            )
-            
             # Handle case where DEEPSEEK_API_KEY is not set
             if isinstance(deepseek_response, int):  # -1 returned when API key missing
                 deepseek_response = "⚠️ AI analysis unavailable (DEEPSEEK_API_KEY not configured)"
@@ -267,10 +428,12 @@ class AutoPRReviewCog(commands.Cog):
                 f"📊 **Lines Added: {responseJson['additions']} | Lines Removed: {responseJson['deletions']}**\n"
                 f"{merge_status}\n"
                 f"📝 **Title:** {responseJson['title']}\n"
-                f"🧠 **AI Summary:**\n"
-                f"{deepseek_response}\n"
-                f"🔗 **Link:** {responseJson['html_url']}"
+                f"🔗 **Link:** {responseJson['html_url']}\n"
+                f"🧠 **AI Summary:**"
             )
+            # one section per reviewed file can run past Discord's 2000 character limit
+            for chunk in split_message(deepseek_response):
+                await ctx.send(chunk)
 
     def load_tracked_feeds(self):
         if os.path.exists(STORAGE_PATH):
@@ -333,18 +496,28 @@ class AutoPRReviewCog(commands.Cog):
             r = m2.group(1)
 
         key = f"Electrium-Mobility/{r}"
-        atom_url = f"https://github.com/Electrium-Mobility/{r}/commits.atom"
+        atom_url = f"{settings.github_web_url}/Electrium-Mobility/{r}/commits.atom"
+
+        if key not in self.tracked_feeds and self.feeds_budget.exceeded:
+            await ctx.send(
+                f"❌ Already tracking {len(self.tracked_feeds)} repos, which is all this bot's memory budget allows. "
+                "Untrack one first."
+            )
+            return
 
         # fetch feed once to get latest id
-        response = requests.get(atom_url)
+        with metrics.timer("github"):
+            async with self.get_session().get(atom_url) as response:
+                status = response.status
+                content = await response.read() if status == 200 else b""
 
-        if response.status_code != 200:
+        if status != 200:
             await ctx.send(
                 f"❌ Repository `{key}` not found. Please provide a repository from Electrium-Mobility."
             )
         else:
 
-            entries = self.parse_atom_entries(response.content)
+            entries = self.parse_atom_entries(content)
             last_id = entries[0]["id"] if entries else ""
 
             self.tracked_feeds[key] = {
@@ -392,75 +565,117 @@ class AutoPRReviewCog(commands.Cog):
             lines.append(f"{key} → {ch_text}")
         await ctx.send("Tracked feeds:\n" + "\n - ".join(lines))
 
-    @tasks.loop(minutes=1)
-    async def poll_atom_feeds(self):
-        if not self.tracked_feeds:
-            return
-        async with aiohttp.ClientSession() as session:
-            for key, info in self.tracked_feeds.items():
-                atom_url = info.get("atom_url")
-                # fetch feed asynchronously using aiohttp
-                try:
+    # Job handler: review one commit from a tracked feed
+    async def review_commit(self, job):
+        key, sha = job.payload["key"], job.payload["sha"]
+        deepseek_response = await self.analyze_diff(
+            f"{settings.github_api_url}/repos/{key}/commits/{sha}",
+            priority=Priority.BACKGROUND,
+        )
+
+        # Handle case where DEEPSEEK_API_KEY is not set
+        if isinstance(deepseek_response, int):  # -1 returned when API key missing
+            return "⚠️ AI analysis unavailable (DEEPSEEK_API_KEY not configured)"
+        return deepseek_response.replace("\\n", "\n").replace("\n**", "\n\n**").strip()
+
+    # Job callback: post the commit notice followed by its review
+    async def post_commit_review(self, job):
+        channel_id = job.payload["channel_id"]
+        channel = self.bot.get_channel(channel_id)
+        if channel is None:
+            # the channel's guild may live on another worker's shards, so ask the REST API
+            try:
+                channel = await self.bot.fetch_channel(channel_id)
+            except Exception:
+                return
+        review = job.result
+        if job.state == FAILED:
+            review = "⚠️ AI analysis failed for this commit."
+        try:
+            await channel.send(job.payload["message"])
+            await channel.send(review)
+        except Exception:
+            pass
+
+    # method to fetch every tracked Atom feed, one request per repo
+    async def fetch_atom_feeds(self):
+        session = self.get_session()
+        feeds = {}
+        for key, info in self.tracked_feeds.items():
+            atom_url = info.get("atom_url")
+            # fetch feed asynchronously using aiohttp
+            try:
+                with metrics.timer("github"):
                     async with session.get(atom_url, timeout=aiohttp.ClientTimeout(total=10)) as response:
                         if response.status != 200:
                             continue
                         # decode bytes to string for XML parsing
                         xml_content = await response.text()
-                        entries = self.parse_atom_entries(xml_content)
-                except Exception as e:
-                    print(f"Error fetching feed `{key}`: {e}")
-                    continue
+                feeds[key] = self.parse_atom_entries(xml_content)
+            except Exception as e:
+                feed_logger.warning("Error fetching feed %s: %s", key, e)
+        return feeds
+
+    # method to fetch recent commits of every tracked repo in batched GraphQL queries
+    async def fetch_graphql_feeds(self):
+        since = {key.split("/", 1)[1]: info.get("since") for key, info in self.tracked_feeds.items()}
+        try:
+            commits = await self.graphql.latest_commits(since)
+        except (GraphQLError, aiohttp.ClientError, asyncio.TimeoutError) as e:
+            feed_logger.warning("Error fetching commits over GraphQL: %s", e)
+            return {}
+        return {f"Electrium-Mobility/{name}": entries for name, entries in commits.items()}
 
-                if not entries:
-                    continue
+    @tasks.loop(minutes=1)
+    async def poll_atom_feeds(self):
+        # with several sharding workers only the elected leader polls
+        if not self.tracked_feeds or not is_leader(self.bot):
+            return
+        if self.graphql is not None:
+            feeds = await self.fetch_graphql_feeds()
+        else:
+            feeds = await self.fetch_atom_feeds()
 
-                newest_id = entries[0]["id"]
-                last_id = info.get("last_id")
-                if last_id == newest_id:
-                    continue
+        for key, entries in feeds.items():
+            info = self.tracked_feeds.get(key)
+            if info is None or not entries:
+                continue
 
-                # find new entries up to newest
-                new_entries = []
-                for e in entries:
-                    if e["id"] == last_id:
-                        break
-                    new_entries.append(e)
-
-                # send notifications oldest-first
-                channel = self.bot.get_channel(info.get("channel_id"))
-                for e in reversed(new_entries):
-                    msg = (
-                        f"🔔 New commit in `{key}`\n"
-                        f"**Author:** {e.get('author', '')}\n"
-                        f"**Message:** {e.get('title', '')}\n"
-                        f"[Link to commit]({e.get('link', '')})"
-                        # ? Maybe include timestamp of commit
-                    )
-
-                    # analyze commit information with deepseek
-                    deepseek_response = self.analyze_diff(e.get('link', ''))
-
-                    # Handle case where DEEPSEEK_API_KEY is not set
-                    if isinstance(deepseek_response, int):  # -1 returned when API key missing
-                        deepseek_response = "⚠️ AI analysis unavailable (DEEPSEEK_API_KEY not configured)"
-                    else:
-                        deepseek_response = (
-                            deepseek_response.replace("\\n", "\n").replace("\n**", "\n\n**").strip()
-                        )
-
-                    try:
-                        if channel:
-                            await channel.send(msg)
-                            await channel.send(deepseek_response)
-                        else:
-                            # fallback: skip or implement owner DM
-                            pass
-                    except Exception:
-                        pass
-
-                # update last_id to newest
-                self.tracked_feeds[key]["last_id"] = newest_id
-                self.save_tracked_feeds()
+            newest_id = entries[0]["id"]
+            last_id = info.get("last_id")
+            if last_id == newest_id:
+                continue
+
+            # find new entries up to newest
+            new_entries = []
+            for e in entries:
+                if e["id"] == last_id:
+                    break
+                new_entries.append(e)
+
+            # queue notifications oldest-first
+            for e in reversed(new_entries):
+                msg = (
+                    f"🔔 New commit in `{key}`\n"
+                    f"**Author:** {e.get('author', '')}\n"
+                    f"**Message:** {e.get('title', '')}\n"
+                    f"[Link to commit]({e.get('link', '')})"
+                    # ? Maybe include timestamp of commit
+                )
+
+                # analyze commit information with deepseek
+                # the feed links to the commit page, the diff comes from the API
+                commit_sha = e.get('link', '').rstrip('/').rsplit('/', 1)[-1]
+                await get_scheduler().submit(
+                    "auto_pr_review.commit_review",
+                    {"key": key, "sha": commit_sha, "channel_id": info.get("channel_id"), "message": msg},
+                    priority=Priority.BACKGROUND,
+                )
+
+            # update last_id to newest; since bounds the next GraphQL history query
+            self.tracked_feeds[key]["last_id"] = newest_id
+            self.tracked_feeds[key]["since"] = entries[0].get("updated")
+            self.save_tracked_feeds()
 
 
 async def setup(bot: commands.Bot):
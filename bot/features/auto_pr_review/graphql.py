@@ -0,0 +1,256 @@
+import asyncio
+import logging
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+import aiohttp
+
+from bot.config import settings
+from bot.core.logging import rate_limited_logger
+from bot.core.metrics import metrics
+
+logger = logging.getLogger(__name__)
+error_logger = rate_limited_logger(f"{__name__}.errors", interval=300, burst=3)
+
+OWNER = "Electrium-Mobility"
+REPOS_PER_QUERY = 25  # aliased repositories per history query, well under GitHub's node limits
+COMMITS_PER_REPO = 20  # same depth as the Atom feed
+FILES_PER_PAGE = 100
+
+_COMMIT_FIELDS = """
+fragment CommitFields on Commit {
+  oid
+  messageHeadline
+  url
+  committedDate
+  author { name }
+}
+"""
+
+_PULL_QUERY = """
+query($owner: String!, $name: String!, $number: Int!, $cursor: String) {
+  rateLimit { cost remaining resetAt }
+  repository(owner: $owner, name: $name) {
+    pullRequest(number: $number) {
+      number
+      title
+      url
+      additions
+      deletions
+      merged
+      isDraft
+      mergeStateStatus
+      author { login }
+      files(first: %d, after: $cursor) {
+        nodes { path additions deletions }
+        pageInfo { hasNextPage endCursor }
+      }
+    }
+  }
+}
+""" % FILES_PER_PAGE
+
+
+class GraphQLError(Exception):
+    """The GraphQL API returned an error or no data."""
+
+
+class GraphQLRateLimited(GraphQLError):
+    """The point budget is too low and the caller did not want to wait for the reset."""
+
+
+def history_query(count: int) -> str:
+    """One query fetching the default-branch history of ``count`` repos, aliased r0..rN."""
+    params = ", ".join(f"$name{i}: String!, $since{i}: GitTimestamp" for i in range(count))
+    repos = "\n".join(
+        f"  r{i}: repository(owner: $owner, name: $name{i}) {{\n"
+        f"    defaultBranchRef {{ target {{ ... on Commit {{\n"
+        f"      history(first: $first, since: $since{i}) {{ nodes {{ ...CommitFields }} }}\n"
+        f"    }} }} }}\n"
+        f"  }}"
+        for i in range(count)
+    )
+    return (
+        f"query($owner: String!, $first: Int!, {params}) {{\n"
+        f"  rateLimit {{ cost remaining resetAt }}\n{repos}\n}}\n{_COMMIT_FIELDS}"
+    )
+
+
+def commit_entry(node: dict) -> dict:
+    """Shape a commit node like a parsed Atom entry so both polling modes share one code path."""
+    return {
+        "id": f"tag:github.com,2008:Grit::Commit/{node['oid']}",
+        "title": node.get("messageHeadline", ""),
+        "link": node.get("url", ""),
+        "updated": node.get("committedDate", ""),
+        "author": (node.get("author") or {}).get("name", ""),
+    }
+
+
+class GitHubGraphQL:
+    """Batched GitHub GraphQL queries that throttle themselves on the rate-limit headers.
+
+    GraphQL requests are charged in points rather than one per call. The
+    remaining budget comes from the ``X-RateLimit-*`` headers and the
+    ``rateLimit { cost }`` field each query asks for. When the remaining
+    points drop below twice the last query's cost (or ``reserve``), queries
+    wait for the reset. Callers that can't wait pass ``max_wait`` and
+    get ``GraphQLRateLimited`` instead.
+    """
+
+    def __init__(self, get_session: Callable[[], aiohttp.ClientSession], token: str,
+                 url: Optional[str] = None, reserve: int = 100):
+        self.get_session = get_session
+        self.url = url or f"{settings.github_api_url}/graphql"
+        self.headers = {"Authorization": f"bearer {token}", "User-Agent": "UtilityBot"}
+        self.reserve = reserve
+        self.limit: Optional[int] = None
+        self.remaining: Optional[int] = None
+        self.reset_at = 0.0
+        self.last_cost = 1
+        self.requests = 0
+
+    def _wait_seconds(self) -> float:
+        now = time.time()
+        if self.reset_at <= now or self.remaining is None:
+            return 0.0
+        if self.remaining < max(self.reserve, 2 * self.last_cost):
+            return self.reset_at - now
+        return 0.0
+
+    def _read_headers(self, headers) -> None:
+        try:
+            if "X-RateLimit-Remaining" in headers:
+                self.remaining = int(headers["X-RateLimit-Remaining"])
+            if "X-RateLimit-Limit" in headers:
+                self.limit = int(headers["X-RateLimit-Limit"])
+            if "X-RateLimit-Reset" in headers:
+                self.reset_at = float(headers["X-RateLimit-Reset"])
+        except ValueError:
+            pass
+
+    def _rate_limited(self, headers) -> None:
+        """Work out when to retry after a 403/429, following GitHub's documented order."""
+        try:
+            # secondary rate limits usually say how long to wait
+            self.reset_at = time.time() + float(headers["Retry-After"])
+        except (KeyError, ValueError):
+            if not (self.remaining == 0 and "X-RateLimit-Reset" in headers):
+                # no hint at all: GitHub asks for at least a minute
+                self.reset_at = time.time() + 60
+            # otherwise the primary budget is spent and _read_headers already took its reset time
+        self.remaining = 0
+
+    async def query(self, query: str, variables: dict, max_wait: Optional[float] = None) -> dict:
+        wait = self._wait_seconds()
+        if wait:
+            if max_wait is not None and wait > max_wait:
+                raise GraphQLRateLimited(f"{self.remaining} points left, resets in {wait:.0f}s")
+            logger.warning("GraphQL budget low (%s points left), waiting %.0fs for reset", self.remaining, wait)
+            await asyncio.sleep(wait)
+
+        self.requests += 1
+        with metrics.timer("github"):
+            async with self.get_session().post(
+                self.url, json={"query": query, "variables": variables}, headers=self.headers
+            ) as response:
+                self._read_headers(response.headers)
+                if response.status in (403, 429):
+                    self._rate_limited(response.headers)
+                    raise GraphQLRateLimited(
+                        f"HTTP {response.status}, retry after {max(0.0, self.reset_at - time.time()):.0f}s"
+                    )
+                if response.status != 200:
+                    raise GraphQLError(f"HTTP {response.status}")
+                body = await response.json()
+
+        if body.get("errors"):
+            error_logger.warning("GraphQL errors: %s", [e.get("message") for e in body["errors"]])
+        data = body.get("data")
+        if not data:
+            raise GraphQLError("GraphQL returned no data")
+        rate = data.get("rateLimit") or {}
+        if "cost" in rate:
+            self.last_cost = rate["cost"]
+            self.remaining = rate.get("remaining", self.remaining)
+        return data
+
+    async def latest_commits(self, since: Dict[str, Optional[str]]) -> Dict[str, List[dict]]:
+        """Newest default-branch commits for each repo name, newest first, as Atom-style entries.
+
+        ``since`` maps repo names to the ISO timestamp of the last commit
+        already seen (or None), so unchanged repos come back nearly empty.
+        """
+        names = list(since)
+        results: Dict[str, List[dict]] = {}
+        for start in range(0, len(names), REPOS_PER_QUERY):
+            chunk = names[start:start + REPOS_PER_QUERY]
+            variables = {"owner": OWNER, "first": COMMITS_PER_REPO}
+            for i, name in enumerate(chunk):
+                variables[f"name{i}"] = name
+                variables[f"since{i}"] = since[name]
+            data = await self.query(history_query(len(chunk)), variables)
+            for i, name in enumerate(chunk):
+                repo = data.get(f"r{i}")
+                if repo is None:
+                    continue  # deleted, renamed or not visible to the token
+                target = ((repo.get("defaultBranchRef") or {}).get("target")) or {}
+                nodes = (target.get("history") or {}).get("nodes") or []
+                results[name] = [commit_entry(node) for node in nodes]
+        return results
+
+    async def pull_request(self, name: str, number: int, max_wait: Optional[float] = None) -> Tuple[Optional[dict], List[dict]]:
+        """PR details and per-file stats, shaped like the REST pulls and pulls/files responses.
+
+        Returns ``(None, [])`` when the PR doesn't exist. Files have no
+        ``patch``; take those from the PR's diff.
+        """
+        details, files, cursor = None, [], None
+        while True:
+            data = await self.query(
+                _PULL_QUERY, {"owner": OWNER, "name": name, "number": number, "cursor": cursor}, max_wait
+            )
+            pr = ((data.get("repository") or {}).get("pullRequest"))
+            if pr is None:
+                return None, []
+            if details is None:
+                details = {
+                    "number": pr["number"],
+                    "title": pr["title"],
+                    "html_url": pr["url"],
+                    "user": {"login": (pr.get("author") or {}).get("login", "ghost")},
+                    "additions": pr["additions"],
+                    "deletions": pr["deletions"],
+                    "merged": pr["merged"],
+                    "mergeable_state": "draft" if pr["isDraft"] else (pr.get("mergeStateStatus") or "unknown").lower(),
+                }
+            for node in pr["files"]["nodes"]:
+                files.append({
+                    "filename": node["path"],
+                    "additions": node["additions"],
+                    "deletions": node["deletions"],
+                    "changes": node["additions"] + node["deletions"],
+                })
+            page = pr["files"]["pageInfo"]
+            if not page["hasNextPage"]:
+                return details, files
+            cursor = page["endCursor"]
+
+
+def split_diff(diff_text: str) -> Dict[str, str]:
+    """Split a multi-file unified diff into per-file patches (hunks only), keyed by new path."""
+    patches: Dict[str, List[str]] = {}
+    lines: Optional[List[str]] = None
+    in_header = False
+    for line in diff_text.splitlines():
+        if line.startswith("diff --git "):
+            lines = patches.setdefault(line.rsplit(" b/", 1)[-1], [])
+            in_header = True
+        elif lines is None:
+            continue
+        elif in_header and not line.startswith("@@"):
+            continue  # index, mode and ---/+++ lines
+        else:
+            in_header = False
+            lines.append(line)
+    return {path: "\n".join(body) for path, body in patches.items() if body}
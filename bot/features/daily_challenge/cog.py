@@ -1,17 +1,166 @@
-from discord.ext import commands
+import json
+import logging
+import os
+import re
+from datetime import datetime, timezone
+
+from discord.ext import commands, tasks
+
+from bot.config import settings
+from bot.core.jobs import FAILED, PENDING, RUNNING, get_scheduler
+from bot.core.llm import Priority, get_llm_gateway
+from bot.core.memory import budgets, deep_sizeof
+from bot.core.sharding import is_leader
+from bot.features.daily_challenge.store import ChallengeStore
+
+logger = logging.getLogger(__name__)
+
+STORE_PATH = os.path.join(settings.data_dir, "daily_challenge", "challenges.json")
+DAYS_AHEAD = 7  # days of challenges kept ready in the store
+BATCH_EXTRA = 3  # extra challenges requested per batch to make up for duplicates
+GENERATE_JOB = "daily_challenge.generate"
+STORE_BUDGET = 1024 * 1024
+STORE_BUDGET_LOW = 256 * 1024
+SHORT_RETENTION_DAYS = 14  # past days kept instead when the store is over budget
+
+
+def _today():
+    # one calendar for every guild so everyone gets the same challenge
+    return datetime.now(timezone.utc).date()
+
+
+def parse_challenges(text: str) -> list:
+    """Pull the JSON array of challenges out of a model reply, dropping malformed entries."""
+    match = re.search(r"\[.*\]", text, re.DOTALL)
+    if not match:
+        return []
+    try:
+        items = json.loads(match.group(0))
+    except ValueError:
+        return []
+    challenges = []
+    for item in items:
+        if not isinstance(item, dict) or not item.get("title") or not item.get("prompt"):
+            continue
+        challenges.append({
+            "title": str(item["title"]).strip(),
+            "difficulty": str(item.get("difficulty", "medium")).strip().lower(),
+            "prompt": str(item["prompt"]).strip(),
+        })
+    return challenges
 
 
 class DailyChallengeCog(commands.Cog):
-    """Daily Challenge feature placeholder implementation."""
+    """Serves one pre-generated challenge per day from a persistent store."""
 
     def __init__(self, bot: commands.Bot):
         self.bot = bot
+        self.store = ChallengeStore(STORE_PATH)
+        self.budget = budgets.register(
+            "daily_challenge", STORE_BUDGET, STORE_BUDGET_LOW,
+            # fingerprints are kept forever on purpose (a few bytes a day), so only stored days count
+            lambda: deep_sizeof(self.store.days),
+        )
+        self.key_missing = False
+        self.last_failed = False
+        get_scheduler().register(GENERATE_JOB, self.generate_challenges, on_done=self.generation_done)
+        self.schedule_generation.start()
+
+    async def cog_unload(self):
+        self.schedule_generation.cancel()
+
+    # Job handler: fill the coming days with one batched LLM call
+    async def generate_challenges(self, job):
+        self.store.reload_if_changed()
+        missing = self.store.missing_days(_today(), DAYS_AHEAD)
+        if not missing:
+            return 0
+
+        job.report(0.1, f"generating {len(missing)} challenges")
+        avoid = "\n".join(f"- {title}" for title in self.store.recent_titles())
+        reply = await get_llm_gateway().chat(
+            [
+                {
+                    "role": "system",
+                    "content": (
+                        "You write short daily challenges for a student engineering design team "
+                        "(software, electrical and mechanical members). Reply with a JSON array only."
+                    ),
+                },
+                {
+                    "role": "user",
+                    "content": (
+                        f"Write {len(missing) + BATCH_EXTRA} distinct challenges, each solvable in under 30 minutes. "
+                        'Each item: {"title": "...", "difficulty": "easy|medium|hard", "prompt": "2-4 sentences"}.\n'
+                        f"Do not repeat any of these recent challenges:\n{avoid or '- (none)'}"
+                    ),
+                },
+            ],
+            feature="daily_challenge",
+            max_tokens=200 * (len(missing) + BATCH_EXTRA),
+            temperature=1.0,
+            priority=Priority.BACKGROUND,
+        )
+        stored = self.store.assign(missing, parse_challenges(reply))
+        logger.info("Stored %d of %d missing daily challenges", stored, len(missing))
+        return stored
+
+    async def generation_done(self, job):
+        self.last_failed = job.state == FAILED
+
+    # Keep the store topped up; only one worker generates. The first tick runs before the
+    # leader election starts, so check every minute until this worker leads and today's
+    # challenge is stored (or generation can't run right now), then hourly. Followers keep
+    # checking so they take over quickly.
+    @tasks.loop(minutes=1)
+    async def schedule_generation(self):
+        if await self.top_up_store():
+            self.schedule_generation.change_interval(hours=1)
+        else:
+            self.schedule_generation.change_interval(minutes=1)
+
+    async def top_up_store(self) -> bool:
+        if not is_leader(self.bot):
+            return False
+        self.store.reload_if_changed()
+        self.store.prune(_today())
+        if self.budget.exceeded:
+            logger.info("Challenge store over its %d byte budget, keeping %d past days", self.budget.limit, SHORT_RETENTION_DAYS)
+            self.store.prune(_today(), SHORT_RETENTION_DAYS)
+        settled = self.store.get(_today()) is not None
+        if not self.store.missing_days(_today(), DAYS_AHEAD):
+            return settled
+        if not get_llm_gateway().configured:
+            if not self.key_missing:
+                logger.warning("DEEPSEEK_API_KEY is not set, daily challenges won't be generated")
+                self.key_missing = True
+            return True
+        self.key_missing = False
+        if self.last_failed:
+            # the failed job already retried a few times; wait an hour before queuing another
+            self.last_failed = False
+            return True
+        scheduler = get_scheduler()
+        if not any(job.kind == GENERATE_JOB for job in scheduler.jobs(PENDING, RUNNING)):
+            await scheduler.submit(GENERATE_JOB, {}, priority=Priority.BACKGROUND)
+        return settled
 
     @commands.command(name="challenge")
     async def challenge(self, ctx: commands.Context):
-        """Placeholder command: return a placeholder challenge."""
-        await ctx.send("(Placeholder response: a daily challenge will be posted here)")
+        """Post today's challenge."""
+        today = _today()
+        self.store.reload_if_changed()
+        challenge = self.store.get(today)
+        if challenge is None:
+            # only happens on a fresh install before the first batch lands
+            await ctx.send("Today's challenge is still being prepared, try again in a minute.")
+            return
+        await ctx.send(
+            f"**Daily Challenge ({today.isoformat()})**\n"
+            f"**{challenge['title']}** ({challenge['difficulty']})\n"
+            f"{challenge['prompt']}"
+        )
 
 
 async def setup(bot: commands.Bot):
-    await bot.add_cog(DailyChallengeCog(bot))
\ No newline at end of file
+    await bot.add_cog(DailyChallengeCog(bot))
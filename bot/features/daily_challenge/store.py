@@ -0,0 +1,96 @@
+import hashlib
+import json
+import logging
+import os
+import re
+from datetime import date, timedelta
+from typing import Dict, Iterable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# past days kept in the file; fingerprints of older challenges are kept forever
+RETENTION_DAYS = 90
+
+
+def fingerprint(text: str) -> str:
+    """Stable fingerprint of a challenge title, ignoring case, punctuation and word order."""
+    words = sorted(set(re.findall(r"[a-z0-9]+", text.lower())))
+    return hashlib.sha1(" ".join(words).encode("utf-8")).hexdigest()[:16]
+
+
+class ChallengeStore:
+    """Date-indexed challenges persisted as JSON, plus a fingerprint index of every challenge ever stored.
+
+    The whole file is small (one entry per day) so it is kept in memory and
+    rewritten atomically on change. Readers in other worker processes pick
+    up the leader's writes through ``reload_if_changed``, which only stats
+    the file.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.days: Dict[str, dict] = {}
+        self.fingerprints = set()
+        self._mtime = None
+        self.reload_if_changed()
+
+    def reload_if_changed(self) -> None:
+        try:
+            mtime = os.stat(self.path).st_mtime_ns
+        except FileNotFoundError:
+            return
+        if mtime == self._mtime:
+            return
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            logger.exception("Could not read challenge store %s", self.path)
+            return
+        self.days = data.get("days", {})
+        self.fingerprints = set(data.get("fingerprints", []))
+        self._mtime = mtime
+
+    def get(self, day: date) -> Optional[dict]:
+        return self.days.get(day.isoformat())
+
+    def missing_days(self, start: date, count: int) -> List[date]:
+        """Days in ``[start, start + count)`` that have no challenge yet."""
+        days = (start + timedelta(days=i) for i in range(count))
+        return [d for d in days if d.isoformat() not in self.days]
+
+    def recent_titles(self, limit: int = 30) -> List[str]:
+        return [self.days[k]["title"] for k in sorted(self.days)[-limit:]]
+
+    def assign(self, days: Iterable[date], challenges: Iterable[dict]) -> int:
+        """Assign fresh challenges to ``days`` in order, skipping duplicates. Returns how many were stored."""
+        days = list(days)
+        stored = 0
+        for challenge in challenges:
+            if not days:
+                break
+            fp = fingerprint(challenge["title"])
+            if fp in self.fingerprints:
+                continue
+            self.fingerprints.add(fp)
+            self.days[days.pop(0).isoformat()] = challenge
+            stored += 1
+        if stored:
+            self._save()
+        return stored
+
+    def prune(self, today: date, retention_days: int = RETENTION_DAYS) -> None:
+        cutoff = (today - timedelta(days=retention_days)).isoformat()
+        old = [k for k in self.days if k < cutoff]
+        for k in old:
+            del self.days[k]
+        if old:
+            self._save()
+
+    def _save(self) -> None:
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        tmp = self.path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"days": self.days, "fingerprints": sorted(self.fingerprints)}, f, ensure_ascii=False)
+        os.replace(tmp, self.path)
+        self._mtime = os.stat(self.path).st_mtime_ns
@@ -0,0 +1,164 @@
+import mmap
+import os
+import struct
+import threading
+import time
+from typing import Dict, Iterator, Optional, Tuple
+
+import numpy as np
+import soundfile as sf
+
+MAGIC = b"UBOPUS1\n"
+# user id, per-user sequence number, arrival time in microseconds, payload length
+RECORD = struct.Struct("<QIQH")
+SAMPLE_RATE = 48000
+FRAME_SIZE = 960  # 20 ms at 48 kHz, what Discord sends per packet
+MAX_GAP_SECONDS = 1.0  # longer silences are shortened so the WAV only holds speech plus short pauses
+MIX_WINDOW_SECONDS = 10.0  # packets arriving later than this behind the newest one are dropped
+JITTER_FRAMES = 3  # consecutive packets arriving within this of their slot are played back to back
+WRITE_BUFFER = 256 * 1024
+
+
+class OpusArchiveWriter:
+    """Append-only file of raw Opus packets, one length-prefixed record per packet.
+
+    ``append`` is called from the voice receive thread and only packs a
+    header and writes to a buffered file, so recording costs no decoding.
+    A crash leaves at most one truncated record at the end, which readers
+    ignore.
+    """
+
+    def __init__(self, path: str, buffer_size: int = WRITE_BUFFER):
+        self.path = path
+        self.buffer_size = buffer_size
+        self.packets = 0
+        self.bytes = 0
+        self._seq: Dict[int, int] = {}
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._file = open(path, "ab", buffering=buffer_size)
+        if self._file.tell() == 0:
+            self._file.write(MAGIC)
+
+    def append(self, user_id: int, packet: bytes, timestamp_us: Optional[int] = None) -> None:
+        if timestamp_us is None:
+            timestamp_us = time.monotonic_ns() // 1000
+        with self._lock:
+            if self._file is None:
+                return
+            seq = self._seq.get(user_id, 0)
+            self._seq[user_id] = seq + 1
+            self._file.write(RECORD.pack(user_id, seq, timestamp_us, len(packet)))
+            self._file.write(packet)
+            self.packets += 1
+            self.bytes += RECORD.size + len(packet)
+
+    def close(self) -> None:
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+
+class OpusArchiveReader:
+    """Memory-maps an archive and iterates its records.
+
+    Only the packet being read is copied out of the map, so reading a long
+    meeting doesn't pull the whole file into memory.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._file = open(path, "rb")
+        size = os.fstat(self._file.fileno()).st_size
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ) if size else None
+        if self._map is not None and self._map[:len(MAGIC)] != MAGIC:
+            self.close()
+            raise ValueError(f"{path} is not an Opus archive")
+
+    def __iter__(self) -> Iterator[Tuple[int, int, int, bytes]]:
+        if self._map is None:
+            return
+        pos, end = len(MAGIC), len(self._map)
+        while pos + RECORD.size <= end:
+            user_id, seq, timestamp_us, length = RECORD.unpack_from(self._map, pos)
+            pos += RECORD.size
+            if pos + length > end:
+                break  # truncated last record
+            yield user_id, seq, timestamp_us, self._map[pos:pos + length]
+            pos += length
+
+    def close(self) -> None:
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def decode_archive(archive_path: str, wav_path: str) -> int:
+    """Decode and mix every speaker in an archive into a mono 16-bit WAV. Returns the samples written.
+
+    Packets are placed by arrival time so overlapping speakers are mixed
+    rather than concatenated, with one Opus decoder per user. Mixing uses a
+    sliding window, so memory stays bounded however long the meeting was.
+    Runs in a worker process, hence the module-level function.
+    """
+    import opuslib
+
+    decoders = {}
+    last = {}  # user id -> (sequence number, sample after their previous packet)
+    window = int(SAMPLE_RATE * MIX_WINDOW_SECONDS)
+    max_gap = int(SAMPLE_RATE * MAX_GAP_SECONDS)
+    mix = np.zeros(2 * window, dtype=np.int32)
+    written = 0  # samples already flushed; mix[0] is sample ``written``
+    end = 0  # furthest sample placed so far
+    start_us = None
+    shift = 0  # samples of silence cut out so far
+
+    with OpusArchiveReader(archive_path) as reader, \
+            sf.SoundFile(wav_path, "w", SAMPLE_RATE, 1, subtype="PCM_16") as out:
+
+        def flush(upto):
+            nonlocal mix, written
+            n = upto - written
+            if n <= 0:
+                return
+            out.write(np.clip(mix[:n], -32768, 32767).astype(np.int16))
+            mix = np.concatenate([mix[n:], np.zeros(n, dtype=np.int32)])
+            written = upto
+
+        for user_id, seq, timestamp_us, payload in reader:
+            decoder = decoders.get(user_id)
+            if decoder is None:
+                decoder = decoders[user_id] = opuslib.Decoder(SAMPLE_RATE, 1)
+            try:
+                pcm = np.frombuffer(decoder.decode(payload, FRAME_SIZE, decode_fec=False), dtype=np.int16)
+            except opuslib.OpusError:
+                continue
+
+            if start_us is None:
+                start_us = timestamp_us
+            offset = (timestamp_us - start_us) * SAMPLE_RATE // 1_000_000 - shift
+            if offset > end + max_gap:
+                shift += offset - (end + max_gap)
+                offset = end + max_gap
+            # arrival times jitter, so keep a speaker's consecutive packets contiguous
+            prev = last.get(user_id)
+            if prev is not None and seq == prev[0] + 1 and abs(offset - prev[1]) <= JITTER_FRAMES * FRAME_SIZE:
+                offset = prev[1]
+            if offset < written:
+                continue
+            last[user_id] = (seq, offset + len(pcm))
+            if offset + len(pcm) - written > len(mix):
+                flush(offset + len(pcm) - window)
+            mix[offset - written:offset - written + len(pcm)] += pcm
+            end = max(end, offset + len(pcm))
+
+        flush(end)
+    return written
@@ -1,27 +1,34 @@
 import discord
-from discord.ext import commands
+from discord.ext import commands, tasks
 import discord.ext.voice_recv as voice_recv
-from openai import OpenAI
-import soundfile as sf
-import numpy as np
 import asyncio
 import os
 import logging
 from dotenv import load_dotenv
 import ctypes
-from deepgram import DeepgramClient
+import aiohttp
+import json
+import shutil
+import time
 from pathlib import Path
 
+from bot.config import settings
+from bot.core.jobs import FAILED, get_scheduler
+from bot.core.llm import Priority, get_llm_gateway
+from bot.core.logging import rate_limited_logger
+from bot.core.metrics import metrics
+from bot.features.meeting_notes.archive import WRITE_BUFFER, OpusArchiveWriter, decode_archive
+
 log = logging.getLogger(__name__)
+# bad packets arrive in bursts of dozens per second from the voice thread
+packet_log = rate_limited_logger(f"{__name__}.packets", interval=30, burst=3)
 
-# Initialize OpenAI client
 load_dotenv()
 
-client = OpenAI(api_key=os.environ.get('DEEPSEEK_API_KEY'), base_url="https://api.deepseek.com")
-
 DEEPGRAM_API_KEY = os.getenv("DEEPGRAM_API_KEY")
-
-deepgram = DeepgramClient(api_key=DEEPGRAM_API_KEY)
+MEETINGS_DIR = os.path.join(settings.data_dir, "meetings")
+# audio goes straight to disk, so the write buffer is all a recording keeps in memory
+ARCHIVE_BUFFER_LOW = 32 * 1024
 
 # Load Opus DLL for audio decoding
 opus_path = os.getenv("OPUS_DLL_PATH")
@@ -49,12 +56,11 @@ ctypes.cdll.LoadLibrary(str(opus_dll_path))
 
 import opuslib
 
-# Decodes incoming Opus audio and stores PCM samples
+# Stores incoming Opus packets as they arrive; decoding waits until transcription
 class CombinedRecorder(voice_recv.AudioSink):
-    def __init__(self, cog):
+    def __init__(self, archive: OpusArchiveWriter):
         super().__init__()
-        self.cog = cog
-        self.decoder = opuslib.Decoder(48000, 1)
+        self.archive = archive
 
     def wants_opus(self) -> bool:
         return True
@@ -62,13 +68,9 @@ class CombinedRecorder(voice_recv.AudioSink):
     def write(self, user, data):
         try:
             if data.opus:
-                pcm = self.decoder.decode(data.opus, 960, decode_fec=False)
-                audio = np.frombuffer(pcm, dtype=np.int16)
-                self.cog.audio_buffer.append(audio)
-        except opuslib.OpusError as e:
-            log.warning(f"Decode error from {user}: {e}")
+                self.archive.append(user.id if user is not None else 0, data.opus)
         except Exception as e:
-            log.error(f"Unexpected error decoding audio: {e}")
+            packet_log.error("Unexpected error archiving audio: %s", e)
 
     def cleanup(self):
         pass
@@ -79,9 +81,18 @@ class MeetingNotesCog(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
         self.vc = None
-        self.audio_buffer = []
+        self.session_id = None
+        self.archive = None
         self.opus_available = self._validate_opus()
+        # transcription and summarization run as jobs so they survive a restart
+        get_scheduler().register("meeting_notes.process", self.process_meeting, on_done=self.post_summary)
+        self.evict_sessions.start()
         super().__init__()
+
+    async def cog_unload(self):
+        self.evict_sessions.cancel()
+        if self.archive is not None:
+            self.archive.close()
     
     def _validate_opus(self) -> bool:
         """Validate that Opus library is loaded correctly."""
@@ -98,29 +109,62 @@ class MeetingNotesCog(commands.Cog):
             log.error(f"❌ Opus library validation failed: {e}")
             return False
 
-    # Create WAV file from recorded audio
+    # Session files: DATA_DIR/meetings/<session id>/{audio.opusarc,session.json}
+    def session_dir(self, session_id):
+        return os.path.join(MEETINGS_DIR, session_id)
+
+    def load_session(self, session_id):
+        with open(os.path.join(self.session_dir(session_id), "session.json"), "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    def save_session(self, session):
+        path = os.path.join(self.session_dir(session["id"]), "session.json")
+        with open(path + ".tmp", "w", encoding="utf-8") as f:
+            json.dump(session, f, ensure_ascii=False)
+        os.replace(path + ".tmp", path)
+
+    # Close the archive for the finished recording and return its session id
     async def cleanup(self):
-        if not self.audio_buffer:
-            print("No audio data received.")
+        archive, session_id = self.archive, self.session_id
+        self.archive = self.session_id = None
+        if archive is None:
+            return None
+        archive.close()
+        if not archive.packets:
+            log.info("No audio data received.")
+            shutil.rmtree(self.session_dir(session_id), ignore_errors=True)
             return None
 
-        # Move blocking I/O to executor to prevent bot freeze
-        def save_audio():
-            all_audio = np.concatenate(self.audio_buffer).astype(np.int16)
-            sf.write("meeting_audio.wav", all_audio, 48000, subtype="PCM_16")
-            print("Audio saved to meeting_audio.wav")
-            return "meeting_audio.wav"
-        
-        loop = self.bot.loop
-        file_path = await loop.run_in_executor(None, save_audio)
-        return file_path
+        session = self.load_session(session_id)
+        session.update(ended=time.time(), packets=archive.packets, bytes=archive.bytes)
+        self.save_session(session)
+        log.info("Archived %d packets (%d bytes) for meeting %s", archive.packets, archive.bytes, session_id)
+        return session_id
     
+    # Transcribe a WAV file with Deepgram's pre-recorded audio endpoint
+    async def transcribe_file(self, file_path):
+        # aiohttp streams an open file in chunks, reading it off the event loop, so the WAV is never held in memory
+        with open(file_path, "rb") as audio_file, metrics.timer("deepgram"):
+            async with aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=300)) as session:
+                async with session.post(
+                    f"{settings.deepgram_api_url}/v1/listen",
+                    params={"model": "nova-3", "smart_format": "true"},
+                    headers={
+                        "Authorization": f"Token {DEEPGRAM_API_KEY}",
+                        "Content-Type": "audio/wav",
+                    },
+                    data=audio_file,
+                ) as resp:
+                    resp.raise_for_status()
+                    data = await resp.json()
+
+        return data["results"]["channels"][0]["alternatives"][0]["transcript"]
+
     # Summarize text using DeepSeek
     async def summarize_text(self, text):
         try:
-            response = client.chat.completions.create(
-                model="deepseek-chat",
-                messages=[
+            return await get_llm_gateway().chat(
+                [
                     {
                         "role": "system",
                         "content": (
@@ -132,14 +176,73 @@ class MeetingNotesCog(commands.Cog):
                     },
                     {"role": "user", "content": text},
                 ],
-                stream=False,
+                feature="meeting_notes",
                 max_tokens=300,
+                priority=Priority.INTERACTIVE,
             )
-            return response.choices[0].message.content.strip()
         except Exception as e:
             log.error(f"Error during summarization: {e}")
             return None
 
+    # Job handler: decode, transcribe and summarize an archived meeting
+    async def process_meeting(self, job):
+        session_id = job.payload["session_id"]
+        session_dir = self.session_dir(session_id)
+        archive_path = os.path.join(session_dir, "audio.opusarc")
+        if not os.path.exists(archive_path):
+            raise FileNotFoundError(archive_path)
+
+        # the WAV only exists while this job runs; the archive is what's kept
+        wav_path = os.path.join(session_dir, "decoded.wav")
+        try:
+            job.report(0.05, "decoding")
+            await job.run_cpu(decode_archive, archive_path, wav_path)
+            job.report(0.3, "transcribing")
+            transcript_text = await self.transcribe_file(wav_path)
+        finally:
+            try:
+                os.remove(wav_path)
+            except OSError:
+                pass
+
+        job.report(0.7, "summarizing")
+        summary = await self.summarize_text(transcript_text)
+        session = self.load_session(session_id)
+        session.update(transcript=transcript_text, summary=summary, processed=time.time())
+        self.save_session(session)
+        return summary
+
+    # Job callback: post the summary
+    async def post_summary(self, job):
+        channel_id = job.payload["channel_id"]
+        channel = self.bot.get_channel(channel_id)
+        if channel is None:
+            channel = await self.bot.fetch_channel(channel_id)
+
+        if job.state == FAILED:
+            await channel.send(f"Error processing meeting: {job.error}")
+        elif job.result:
+            await channel.send(f"**Meeting Summary:**\n```{job.result}```")
+        else:
+            await channel.send("Could not generate a summary.")
+
+    # Remove archived meetings older than the retention period
+    @tasks.loop(hours=6)
+    async def evict_sessions(self):
+        if not os.path.isdir(MEETINGS_DIR):
+            return
+        cutoff = time.time() - settings.meeting_retention_days * 86400
+        for session_id in os.listdir(MEETINGS_DIR):
+            if session_id == self.session_id:
+                continue
+            try:
+                started = self.load_session(session_id)["started"]
+            except (OSError, ValueError, KeyError):
+                continue
+            if started < cutoff:
+                shutil.rmtree(self.session_dir(session_id), ignore_errors=True)
+                log.info("Evicted meeting %s", session_id)
+
     # Command to start recording
     @commands.command(name="record")
     async def record(self, ctx):
@@ -150,10 +253,25 @@ class MeetingNotesCog(commands.Cog):
         if ctx.author.voice is None:
             return await ctx.send("You must be in a voice channel to use this command.")
 
+        if self.vc:
+            return await ctx.send("Already recording, use `!stop` first.")
+
         channel = ctx.author.voice.channel
         self.vc = await channel.connect(cls=voice_recv.VoiceRecvClient)
 
-        self.recorder = CombinedRecorder(self)
+        # guild in the id so workers recording in different servers never collide
+        self.session_id = time.strftime("%Y%m%d-%H%M%S") + (f"-{ctx.guild.id}" if ctx.guild else "")
+        os.makedirs(self.session_dir(self.session_id), exist_ok=True)
+        self.save_session({
+            "id": self.session_id,
+            "started": time.time(),
+            "guild_id": ctx.guild.id if ctx.guild else None,
+            "channel_id": ctx.channel.id,
+        })
+        self.archive = OpusArchiveWriter(
+            os.path.join(self.session_dir(self.session_id), "audio.opusarc"), buffer_size=ARCHIVE_BUFFER_LOW if settings.low_memory else WRITE_BUFFER
+        )
+        self.recorder = CombinedRecorder(self.archive)
         self.vc.listen(self.recorder)
 
         await ctx.send("Started recording... use `!stop` to end.")
@@ -169,40 +287,49 @@ class MeetingNotesCog(commands.Cog):
             return await ctx.send("I'm not currently recording.")
 
         await self.vc.disconnect(force=True)
+        self.vc = None
         await ctx.send("Stopped recording. Processing meeting audio...")
 
-        file_path = await self.cleanup()
-        if not file_path:
+        session_id = await self.cleanup()
+        if not session_id:
             return await ctx.send("No audio captured.")
 
-        await asyncio.sleep(2)
-
-        # Transcribe audio using OpenAI Whisper
-        try:
-            with open(file_path, "rb") as audio_file:
-                response = deepgram.listen.v1.media.transcribe_file(
-                    request=audio_file.read(),
-                    model="nova-3",
-                    smart_format=True,
-                )
-            transcript_text = response.results.channels[0].alternatives[0].transcript
-            summary = await self.summarize_text(transcript_text)
-
-            if summary:
-                await ctx.send(f"**Meeting Summary:**\n```{summary}```")
-            else:
-                await ctx.send("Could not generate a summary.")
-        except Exception as e:
-            await ctx.send(f"Error processing meeting: {e}")
-            log.error(e)
-
-        # Clean up audio file
-        try:
-            await asyncio.sleep(1)
-            os.remove(file_path)
-            await ctx.send("Cleaned up audio file.")
-        except OSError as e:
-            log.warning(f"Could not delete audio file: {e}")
+        # Transcription and summary are posted here when the job finishes
+        await get_scheduler().submit(
+            "meeting_notes.process",
+            {"session_id": session_id, "channel_id": ctx.channel.id},
+            priority=Priority.INTERACTIVE,
+        )
+
+    # Owner command: list archived meetings
+    @commands.command(name="meetings")
+    @commands.is_owner()
+    async def meetings(self, ctx):
+        if not os.path.isdir(MEETINGS_DIR):
+            return await ctx.send("No archived meetings.")
+        lines = []
+        for session_id in sorted(os.listdir(MEETINGS_DIR), reverse=True)[:15]:
+            try:
+                session = self.load_session(session_id)
+            except (OSError, ValueError):
+                continue
+            minutes = (session.get("ended", session["started"]) - session["started"]) / 60
+            state = "summarized" if session.get("summary") else "not summarized"
+            lines.append(f"- `{session_id}`: {minutes:.0f} min, {session.get('bytes', 0) / 2**20:.1f} MiB, {state}")
+        await ctx.send("\n".join(lines) if lines else "No archived meetings.")
+
+    # Owner command: transcribe and summarize an archived meeting again
+    @commands.command(name="resummarize")
+    @commands.is_owner()
+    async def resummarize(self, ctx, session_id: str):
+        if not os.path.exists(os.path.join(self.session_dir(session_id), "audio.opusarc")):
+            return await ctx.send(f"No archived meeting `{session_id}`, see `!meetings`.")
+        await get_scheduler().submit(
+            "meeting_notes.process",
+            {"session_id": session_id, "channel_id": ctx.channel.id},
+            priority=Priority.INTERACTIVE,
+        )
+        await ctx.send(f"Reprocessing meeting `{session_id}`...")
 
 
 async def setup(bot):
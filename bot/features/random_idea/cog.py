@@ -1,17 +1,151 @@
-from discord.ext import commands
+import json
+import logging
+import os
+import re
+import time
+
+from discord.ext import commands, tasks
+
+from bot.config import settings
+from bot.core.jobs import FAILED, PENDING, RUNNING, get_scheduler
+from bot.core.llm import Priority, get_llm_gateway
+from bot.core.memory import budgets
+from bot.features.random_idea.pool import IdeaPool
+
+logger = logging.getLogger(__name__)
+
+LOW_WATER = 10  # refill when fewer unserved ideas than this are left
+HIGH_WATER = 40  # refill until this many are ready
+BATCH_SIZE = 20  # ideas requested per LLM call
+MAX_BATCHES = 4  # per refill, in case most of a batch turns out to be duplicates
+REFILL_JOB = "random_idea.refill"
+REFILL_BACKOFF = 15 * 60  # seconds before another refill after one failed for good
+POOL_BUDGET = 8 * 1024 * 1024
+POOL_BUDGET_LOW = 1024 * 1024
+
+
+def parse_ideas(text: str) -> list:
+    """Pull the JSON array of idea strings out of a model reply."""
+    match = re.search(r"\[.*\]", text, re.DOTALL)
+    if not match:
+        return []
+    try:
+        items = json.loads(match.group(0))
+    except ValueError:
+        return []
+    return [str(item) for item in items if isinstance(item, str) and item.strip()]
 
 
 class RandomIdeaCog(commands.Cog):
-    """Random Idea Generator feature placeholder implementation."""
+    """Serves project ideas from a pool that is refilled in the background."""
 
     def __init__(self, bot: commands.Bot):
         self.bot = bot
+        # guilds live on one worker's shards, so each worker keeps its own pool
+        worker = getattr(bot, "worker_index", 0)
+        self.pool = IdeaPool(os.path.join(settings.data_dir, "random_idea", f"pool-worker{worker}.json"))
+        self.budget = budgets.register("random_idea", POOL_BUDGET, POOL_BUDGET_LOW, self.pool.approx_bytes)
+        self.key_missing = False
+        self.retry_at = 0.0
+        get_scheduler().register(REFILL_JOB, self.refill, on_done=self.refill_done)
+        self.maintain_pool.start()
+
+    async def cog_unload(self):
+        self.maintain_pool.cancel()
+        if self.pool.dirty:
+            self.pool.write(self.pool.snapshot())
+
+    # Job handler: generate batches until the pool is back above the high-water mark
+    async def refill(self, job):
+        added = 0
+        for batch in range(MAX_BATCHES):
+            if len(self.pool.fresh) >= HIGH_WATER:
+                break
+            job.report(batch / MAX_BATCHES, f"{len(self.pool.fresh)} ready")
+            recent = "\n".join(f"- {idea}" for idea in self.pool.recent())
+            reply = await get_llm_gateway().chat(
+                [
+                    {
+                        "role": "system",
+                        "content": (
+                            "You suggest project ideas for a student design team building personal electric "
+                            "vehicles and the software around them. Reply with a JSON array of strings only."
+                        ),
+                    },
+                    {
+                        "role": "user",
+                        "content": (
+                            f"Give {BATCH_SIZE} varied, one-sentence project ideas. "
+                            f"Avoid anything close to these:\n{recent or '- (none)'}"
+                        ),
+                    },
+                ],
+                feature="random_idea",
+                max_tokens=60 * BATCH_SIZE,
+                temperature=1.2,
+                priority=Priority.BACKGROUND,
+            )
+            added += sum(1 for idea in parse_ideas(reply) if self.pool.add(idea))
+        logger.info("Idea pool refilled with %d ideas, %d ready", added, len(self.pool.fresh))
+        self.enforce_budget()
+        await get_scheduler().run_blocking(self.pool.write, self.pool.snapshot())
+        return added
+
+    async def refill_done(self, job):
+        if job.state == FAILED:
+            self.retry_at = time.monotonic() + REFILL_BACKOFF
+
+    async def request_refill(self):
+        if len(self.pool.fresh) >= LOW_WATER:
+            return
+        if not get_llm_gateway().configured:
+            if not self.key_missing:
+                logger.warning("DEEPSEEK_API_KEY is not set, the idea pool won't be refilled")
+                self.key_missing = True
+            return
+        self.key_missing = False
+        if time.monotonic() < self.retry_at:
+            return
+        scheduler = get_scheduler()
+        if any(job.kind == REFILL_JOB for job in scheduler.jobs(PENDING, RUNNING)):
+            return
+        await scheduler.submit(REFILL_JOB, {}, priority=Priority.BACKGROUND)
+
+    def enforce_budget(self):
+        """Bring the pool back under budget, with some headroom.
+
+        Half the budget goes to live ideas and half to the retired signatures
+        that keep dropped ideas from being generated again.
+        """
+        used = self.budget.used
+        if used <= self.budget.limit:
+            return
+        half = self.budget.limit // 2
+        index = self.pool.index
+        live = used - index.retired.nbytes
+        keep = len(self.pool.ideas) if live <= half else int(len(self.pool.ideas) * half / live * 0.8)
+        dropped = self.pool.compact(keep, max_retired=half // index.retired_row_bytes)
+        logger.info("Idea pool over its %d byte budget, dropped the %d oldest ideas", self.budget.limit, dropped)
+
+    @tasks.loop(minutes=1)
+    async def maintain_pool(self):
+        self.enforce_budget()
+        await self.request_refill()
+        if self.pool.dirty:
+            await get_scheduler().run_blocking(self.pool.write, self.pool.snapshot())
 
     @commands.command(name="idea")
     async def idea(self, ctx: commands.Context):
-        """Placeholder command: return a placeholder idea."""
-        await ctx.send("(Placeholder response: a random idea will be generated here)")
+        """Post an idea this server hasn't seen yet."""
+        guild_id = ctx.guild.id if ctx.guild else ctx.channel.id
+        idea = self.pool.take(guild_id)
+        # never wait on generation here; the refill job runs in the background
+        await self.request_refill()
+        if idea is None:
+            await ctx.send("Fresh ideas are being generated, try again in a minute.")
+            return
+        await ctx.send(f"💡 {idea}")
 
 
 async def setup(bot: commands.Bot):
-    await bot.add_cog(RandomIdeaCog(bot))
\ No newline at end of file
+    await bot.add_cog(RandomIdeaCog(bot))
@@ -0,0 +1,244 @@
+import base64
+import hashlib
+import json
+import logging
+import os
+import random
+import re
+import sys
+from collections import deque
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+_PRIME = (1 << 61) - 1
+RETIRED = -1  # find_similar's key for a match among texts dropped by compaction
+
+
+def shingles(text: str, k: int = 2) -> set:
+    """Word k-grams of the normalised text; short texts fall back to their words."""
+    words = re.findall(r"[a-z0-9]+", text.lower())
+    if len(words) <= k:
+        return {" ".join(words)}
+    return {" ".join(words[i:i + k]) for i in range(len(words) - k + 1)}
+
+
+class MinHashIndex:
+    """MinHash signatures with LSH banding for near-duplicate lookups.
+
+    Each text gets ``num_perm`` min-hashes over its shingles. Signatures are
+    split into ``bands``; two texts become candidates when any band matches
+    exactly, and a candidate counts as a duplicate when the fraction of equal
+    min-hashes (an estimate of their Jaccard similarity) reaches ``threshold``.
+    Lookups touch one bucket per band instead of every stored text.
+
+    Pairs become candidates with probability ``1 - (1 - s**rows)**bands``
+    at similarity ``s``; 16 bands of 2 rows put the cut-off near 0.25, so
+    pairs at ``threshold`` are almost always checked.
+
+    Texts dropped by ``retire`` keep only their signature, truncated to 32
+    bits per hash and stored as one row of a numpy array (128 bytes instead
+    of several KB of tuples and buckets), and are compared against with one
+    vectorised scan.
+    """
+
+    def __init__(self, num_perm: int = 32, bands: int = 16, threshold: float = 0.5, seed: int = 1):
+        rng = random.Random(seed)
+        self._perms = [(rng.randrange(1, _PRIME), rng.randrange(0, _PRIME)) for _ in range(num_perm)]
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.threshold = threshold
+        self._buckets: Dict[Tuple[int, tuple], List[int]] = {}
+        self._signatures: Dict[int, tuple] = {}
+        self.retired = np.empty((0, num_perm), dtype=np.uint32)
+
+    def signature(self, text: str) -> tuple:
+        hashes = [
+            int.from_bytes(hashlib.blake2b(s.encode("utf-8"), digest_size=8).digest(), "little")
+            for s in shingles(text)
+        ]
+        return tuple(min((a * h + b) % _PRIME for h in hashes) for a, b in self._perms)
+
+    def _bands(self, sig: tuple):
+        for band in range(self.bands):
+            yield band, sig[band * self.rows:(band + 1) * self.rows]
+
+    def find_similar(self, sig: tuple) -> Optional[int]:
+        """Key of a stored text similar to ``sig``, ``RETIRED`` for a retired one, or None."""
+        checked = set()
+        for key in self._bands(sig):
+            for candidate in self._buckets.get(key, ()):
+                if candidate in checked:
+                    continue
+                checked.add(candidate)
+                other = self._signatures[candidate]
+                same = sum(1 for x, y in zip(sig, other) if x == y)
+                if same / len(sig) >= self.threshold:
+                    return candidate
+        if len(self.retired):
+            same = int((self.retired == _pack([sig])[0]).sum(axis=1).max())
+            if same / len(sig) >= self.threshold:
+                return RETIRED
+        return None
+
+    def add(self, key: int, sig: tuple) -> None:
+        self._signatures[key] = sig
+        for band in self._bands(sig):
+            self._buckets.setdefault(band, []).append(key)
+
+    @property
+    def signature_bytes(self) -> int:
+        """Rough memory per stored text: the signature tuple and its ints, plus a band tuple and bucket per band."""
+        return sys.getsizeof((0,) * len(self._perms)) + 36 * len(self._perms) + 200 * self.bands
+
+    @property
+    def retired_row_bytes(self) -> int:
+        return self.retired.itemsize * self.retired.shape[1]
+
+    def retire(self, drop: int, max_retired: int) -> None:
+        """Retire keys below ``drop``, keeping the newest ``max_retired`` retired signatures, and shift the rest down."""
+        old = [self._signatures[key] for key in sorted(self._signatures) if key < drop]
+        if old:
+            self.retired = np.vstack([self.retired, _pack(old)])
+        if len(self.retired) > max_retired:
+            self.retired = self.retired[len(self.retired) - max_retired:].copy()
+        if not drop:
+            return
+        signatures = {key - drop: sig for key, sig in self._signatures.items() if key >= drop}
+        self._signatures, self._buckets = {}, {}
+        for key, sig in signatures.items():
+            self.add(key, sig)
+
+
+def _pack(signatures: List[tuple]) -> np.ndarray:
+    # min-hashes are below 2**61; the low 32 bits are as good for comparing
+    return (np.array(signatures, dtype=np.uint64) & 0xFFFFFFFF).astype(np.uint32)
+
+
+class IdeaPool:
+    """Generated ideas, a queue of ones never served anywhere, and a seen-bitset per guild.
+
+    Idea ``i`` is bit ``i`` of a guild's bitset, so tracking costs one bit
+    per idea per guild and checking or marking is a single byte operation.
+    """
+
+    def __init__(self, path: str, index: Optional[MinHashIndex] = None):
+        self.path = path
+        self.index = index or MinHashIndex()
+        self.ideas: List[str] = []
+        self.fresh = deque()
+        self.seen: Dict[int, bytearray] = {}
+        self.dirty = False
+        self._load()
+
+    def add(self, text: str) -> bool:
+        """Add a generated idea unless it is a near-duplicate of one already stored."""
+        text = text.strip()
+        if not text:
+            return False
+        sig = self.index.signature(text)
+        if self.index.find_similar(sig) is not None:
+            return False
+        idx = len(self.ideas)
+        self.ideas.append(text)
+        self.index.add(idx, sig)
+        self.fresh.append(idx)
+        self.dirty = True
+        return True
+
+    def has_seen(self, guild_id: int, idx: int) -> bool:
+        bits = self.seen.get(guild_id)
+        return bits is not None and idx >> 3 < len(bits) and bool(bits[idx >> 3] & (1 << (idx & 7)))
+
+    def mark_seen(self, guild_id: int, idx: int) -> None:
+        bits = self.seen.setdefault(guild_id, bytearray())
+        if idx >> 3 >= len(bits):
+            bits.extend(bytes((idx >> 3) - len(bits) + 1))
+        bits[idx >> 3] |= 1 << (idx & 7)
+        self.dirty = True
+
+    def take(self, guild_id: int, rng=random, attempts: int = 8) -> Optional[str]:
+        """Next idea this guild hasn't seen, or None when the pool has nothing new for it.
+
+        Fresh ideas come first. When they run out, a few random earlier ideas
+        are tried against the guild's bitset so the cost stays bounded.
+        """
+        while self.fresh:
+            idx = self.fresh.popleft()
+            if not self.has_seen(guild_id, idx):
+                self.mark_seen(guild_id, idx)
+                return self.ideas[idx]
+        if not self.ideas:
+            return None
+        for _ in range(attempts):
+            idx = rng.randrange(len(self.ideas))
+            if not self.has_seen(guild_id, idx):
+                self.mark_seen(guild_id, idx)
+                return self.ideas[idx]
+        return None
+
+    def approx_bytes(self) -> int:
+        """Estimated memory held by the pool, cheap enough to check every minute."""
+        return (
+            sum(sys.getsizeof(text) for text in self.ideas)
+            + len(self.ideas) * self.index.signature_bytes
+            + sum(len(bits) for bits in self.seen.values())
+            + self.index.retired.nbytes
+        )
+
+    def compact(self, keep: int, max_retired: int) -> int:
+        """Drop all but the newest ``keep`` ideas, renumbering ids and bitsets. Returns how many were dropped.
+
+        Dropped ideas stay in the index as retired signatures, so their
+        near-duplicates are still rejected; only the newest ``max_retired``
+        of those are kept.
+        """
+        drop = max(0, len(self.ideas) - keep)
+        if drop:
+            self.ideas = self.ideas[drop:]
+            self.fresh = deque(idx - drop for idx in self.fresh if idx >= drop)
+            for guild_id, bits in self.seen.items():
+                value = int.from_bytes(bits, "little") >> drop
+                self.seen[guild_id] = bytearray(value.to_bytes((value.bit_length() + 7) // 8, "little"))
+        self.index.retire(drop, max_retired)
+        self.dirty = True
+        return drop
+
+    def recent(self, limit: int = 20) -> List[str]:
+        return self.ideas[-limit:]
+
+    def snapshot(self) -> dict:
+        """JSON-ready copy of the pool state, cheap enough to take on the event loop."""
+        self.dirty = False
+        return {
+            "ideas": list(self.ideas),
+            "fresh": list(self.fresh),
+            "seen": {str(g): base64.b64encode(bytes(bits)).decode("ascii") for g, bits in self.seen.items()},
+            "retired": base64.b64encode(self.index.retired.tobytes()).decode("ascii"),
+        }
+
+    def write(self, snapshot: dict) -> None:
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        tmp = self.path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(snapshot, f, ensure_ascii=False)
+        os.replace(tmp, self.path)
+
+    def _load(self) -> None:
+        if not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            logger.exception("Could not read idea pool %s", self.path)
+            return
+        self.ideas = data.get("ideas", [])
+        for idx, text in enumerate(self.ideas):
+            self.index.add(idx, self.index.signature(text))
+        self.fresh = deque(data.get("fresh", []))
+        self.seen = {int(g): bytearray(base64.b64decode(b)) for g, b in data.get("seen", {}).items()}
+        retired = np.frombuffer(base64.b64decode(data.get("retired", "")), dtype=np.uint32)
+        self.index.retired = retired.reshape(-1, self.index.retired.shape[1]).copy()
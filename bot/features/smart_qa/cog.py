@@ -6,6 +6,10 @@ import logging
 import os
 import aiohttp
 
+from bot.config import settings
+from bot.core.llm import LLMError, LLMUnavailable, Priority, get_llm_gateway
+from bot.core.metrics import metrics
+
 # Chroma could be implemented to support semantic search on large files if needed
 #_DISABLE_CHROMA = os.getenv("DISABLE_CHROMA", "").lower() in {"1","true","yes","on"}
 
@@ -28,55 +32,33 @@ def _get_knowledge_document() -> str:
 
 async def _ask_deepseek(question: str, knowledge_document: str) -> Optional[str]:
     """Ask DeepSeek with knowledge context. Returns answer or None on failure."""
-    api_key = os.getenv("DEEPSEEK_API_KEY", "").strip()
-    if not api_key:
-        return None
-
-    url = "https://api.deepseek.com/v1/chat/completions"
-    payload = {
-        "model": "deepseek-chat",
-        "temperature": 0.2,
-        "messages": [
-            {
-                "role": "system",
-                "content": (
-                    "You are a helpful assistant. Answer strictly using the provided knowledge. "
-                    "If the answer is not present, say: 'I don't know based on the provided knowledge.'"
-                ),
-            },
-            {
-                "role": "user",
-                "content": (
-                    f"Knowledge:\n{knowledge_document}\n\n"
-                    f"Question:\n{question}\n\n"
-                    "Answer in 1-2 concise sentences."
-                ),
-            },
-        ],
-    }
-
-    # Standard header
-    headers = {
-        "Authorization": f"Bearer {api_key}",
-        "Content-Type": "application/json",
-    }
+    messages = [
+        {
+            "role": "system",
+            "content": (
+                "You are a helpful assistant. Answer strictly using the provided knowledge. "
+                "If the answer is not present, say: 'I don't know based on the provided knowledge.'"
+            ),
+        },
+        {
+            "role": "user",
+            "content": (
+                f"Knowledge:\n{knowledge_document}\n\n"
+                f"Question:\n{question}\n\n"
+                "Answer in 1-2 concise sentences."
+            ),
+        },
+    ]
 
     try:
-        async with aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=20)) as session:
-            async with session.post(url, json=payload, headers=headers) as resp:
-                if resp.status != 200:
-                    logger.warning("DeepSeek API non-200: %s", resp.status)
-                    return None
-
-                # Handles none type at each level
-                data = await resp.json()
-                choices = (data or {}).get("choices") or []
-                if not choices:
-                    return None
-                content = (((choices[0] or {}).get("message") or {}).get("content") or "").strip()
-
-                return content or None
-    except Exception:
+        content = await get_llm_gateway().chat(
+            messages, feature="smart_qa", temperature=0.2, priority=Priority.INTERACTIVE
+        )
+        return content or None
+    except LLMUnavailable as e:
+        logger.warning("DeepSeek unavailable: %s", e)
+        return None
+    except LLMError:
         logger.exception("DeepSeek API call failed")
         return None
 import aiohttp
@@ -88,7 +70,7 @@ class SmartQACog(commands.Cog):
     def __init__(self, bot: commands.Bot):
         self.bot = bot
         # get API info
-        self.api_url = os.getenv("OUTLINE_API_URL")
+        self.api_url = settings.outline_api_url
         self.api_token = os.getenv("OUTLINE_API_KEY")
 
     @commands.command(name="qa")
@@ -100,9 +82,10 @@ class SmartQACog(commands.Cog):
         """Fetch all collections."""
         headers = {"Authorization": f"Bearer {self.api_token}"}
         async with aiohttp.ClientSession() as session:
-            async with session.post(f"{self.api_url}/collections.list", headers=headers) as resp:
-                res = await resp.json()
-                return res.get("data", [])
+            with metrics.timer("outline"):
+                async with session.post(f"{self.api_url}/collections.list", headers=headers) as resp:
+                    res = await resp.json()
+            return res.get("data", [])
 
     async def _fetch_documents(self, collection_id):
         """Fetch all documents in a collection (recursively)."""
@@ -110,9 +93,10 @@ class SmartQACog(commands.Cog):
         data = {"collectionId": collection_id}
 
         async with aiohttp.ClientSession() as session:
-            async with session.post(f"{self.api_url}/documents.list", headers=headers, json=data) as resp:
-                res = await resp.json()
-                return res.get("data", [])
+            with metrics.timer("outline"):
+                async with session.post(f"{self.api_url}/documents.list", headers=headers, json=data) as resp:
+                    res = await resp.json()
+            return res.get("data", [])
 
 
 
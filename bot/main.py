@@ -1,45 +1,121 @@
 import logging
 import os
+from typing import List, Optional
 from dotenv import load_dotenv
 import discord
 from discord.ext import commands
 import asyncio
 
+from bot.config import settings
+from bot.core.jobs import get_scheduler
+from bot.core.llm import close_llm_gateway
 from bot.core.loader import load_feature_extensions
+from bot.core.logging import setup_logging
+from bot.core.memory import client_options, start_tracing
+from bot.core.metrics import LoopLagMonitor, install_command_hooks, start_metrics_server
+from bot.core.sharding import LeaderElection, launch_workers, report_shard_health
 
-def create_bot() -> commands.Bot:
+def create_bot(shard_ids: Optional[List[int]] = None, shard_count: Optional[int] = None) -> commands.Bot:
     intents = discord.Intents.default()
     intents.message_content = True
     intents.voice_states = True
     intents.guilds = True
-    bot = commands.Bot(command_prefix="!", intents=intents)
+    if settings.sharded or shard_ids is not None:
+        # shard_count=None lets Discord pick the recommended number of shards
+        bot = commands.AutoShardedBot(
+            command_prefix="!", intents=intents, shard_ids=shard_ids, shard_count=shard_count,
+            **client_options(intents),
+        )
+    else:
+        bot = commands.Bot(command_prefix="!", intents=intents, **client_options(intents))
+    install_command_hooks(bot)
     return bot
 
 
-async def main_async():
+async def main_async(worker_index: int = 0, shard_ids: Optional[List[int]] = None, shard_count: Optional[int] = None):
     load_dotenv()
-    logging.basicConfig(level=logging.INFO)
+    log_file = settings.log_file
+    if log_file and shard_ids is not None:
+        # workers are separate processes, so each needs its own file to rotate safely
+        root, ext = os.path.splitext(log_file)
+        log_file = f"{root}.worker{worker_index}{ext}"
+    setup_logging(settings.log_level, settings.log_json, log_file)
+    if settings.memory_trace:
+        # before anything is loaded so every cog's allocations are attributed
+        start_tracing()
     logger = logging.getLogger("utilitybot")
 
-    bot = create_bot()
+    bot = create_bot(shard_ids, shard_count or settings.shard_count)
+    bot.worker_index = worker_index
+    if shard_ids is not None:
+        # several workers share this host; only the elected one runs singleton jobs
+        bot.leader_election = LeaderElection(os.path.join(settings.data_dir, "leader.lock"), worker_index)
 
     @bot.event
     async def on_ready():
         logger.info(f"✅ Logged in as {bot.user} (ID: {bot.user.id})")
 
+    @bot.event
+    async def on_shard_disconnect(shard_id):
+        logger.warning("Shard %d disconnected", shard_id)
+
+    @bot.event
+    async def on_shard_resumed(shard_id):
+        logger.info("Shard %d resumed", shard_id)
+
     # Load all feature modules (await!)
     await load_feature_extensions(bot)
+    await bot.load_extension("bot.core.admin")
 
     token = os.getenv("DISCORD_TOKEN")
     if not token:
         logger.error("DISCORD_TOKEN is not set in .env.")
         return
 
-    await bot.start(token)
+    # cogs registered their job handlers while loading; per-worker state so workers don't share a file
+    scheduler = get_scheduler()
+    await scheduler.start(os.path.join(settings.data_dir, f"jobs-worker{worker_index}.json"))
+    lag_monitor = LoopLagMonitor(threshold=settings.loop_lag_threshold_seconds)
+    lag_monitor.start()
+    metrics_runner = None
+    if settings.metrics_port:
+        # one port per worker so they don't collide
+        metrics_runner = await start_metrics_server(settings.metrics_port + worker_index)
+    election = getattr(bot, "leader_election", None)
+    if election is not None:
+        election.start()
+    health_task = None
+    if isinstance(bot, commands.AutoShardedBot):
+        health_task = asyncio.create_task(report_shard_health(bot, settings.data_dir, worker_index))
+
+    try:
+        await bot.start(token)
+    finally:
+        if health_task is not None:
+            health_task.cancel()
+        if election is not None:
+            election.release()
+        lag_monitor.stop()
+        await scheduler.stop()
+        if metrics_runner is not None:
+            await metrics_runner.cleanup()
+        await close_llm_gateway()
+
+
+def run_worker(worker_index: int, shard_ids: List[int], shard_count: int):
+    """Process entry point used by the sharded launcher."""
+    asyncio.run(main_async(worker_index, shard_ids, shard_count))
 
 
 def main():
-    asyncio.run(main_async())
+    if settings.shard_workers > 1:
+        setup_logging(settings.log_level, settings.log_json, settings.log_file)
+        if not settings.shard_count:
+            logging.getLogger("utilitybot").error("SHARD_COUNT must be set when SHARD_WORKERS > 1.")
+            return
+        launch_workers(run_worker, settings.shard_count, settings.shard_workers)
+    else:
+        asyncio.run(main_async())
 
 
 if __name__ == "__main__":
@@ -0,0 +1 @@
+"""End-to-end load testing against local stand-ins for the bot's external services."""
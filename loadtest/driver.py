@@ -0,0 +1,216 @@
+"""Fire simulated command and feed traffic at the cogs against local fake services.
+
+Usage:
+    python -m loadtest.driver --users 20 --duration 30
+    python -m loadtest.driver --latency 0.3 --error-rate 0.05 --github-rate-limit 200
+"""
+import argparse
+import asyncio
+import importlib
+import os
+import random
+import tempfile
+import time
+from collections import defaultdict
+from types import SimpleNamespace
+from typing import Dict, List
+
+from loadtest.fakes import FaultProfile, commit_entry_id, start_fakes
+
+
+class FakeChannel:
+    def __init__(self, channel_id: int):
+        self.id = channel_id
+        self.mention = f"<#{channel_id}>"
+        self.sent = 0
+
+    async def send(self, content=None, **kwargs):
+        self.sent += 1
+
+
+class FakeBot:
+    """Just enough of commands.Bot for the cogs under test."""
+
+    def __init__(self):
+        self.channel = FakeChannel(1)
+        self.user = SimpleNamespace(id=0, name="loadtest")
+
+    def get_channel(self, channel_id):
+        return self.channel if channel_id == self.channel.id else None
+
+    async def wait_for(self, event, check=None, timeout=None):
+        # !docs waits for the user to pick a collection
+        return SimpleNamespace(content="Engineering", author=None, channel=self.channel)
+
+
+class FakeContext:
+    def __init__(self, bot: FakeBot, user_id: int):
+        self.bot = bot
+        self.author = SimpleNamespace(id=user_id, name=f"user{user_id}")
+        self.channel = bot.channel
+        self.message = SimpleNamespace(content="", author=self.author, channel=self.channel)
+
+    async def send(self, content=None, **kwargs):
+        await self.channel.send(content)
+
+
+def _percentile(values: List[float], q: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+def _parse_mix(value: str) -> Dict[str, int]:
+    mix = {}
+    for part in value.split(","):
+        name, _, weight = part.partition("=")
+        mix[name.strip()] = int(weight or 1)
+    return mix
+
+
+async def run(args) -> None:
+    profile = FaultProfile(latency=args.latency, jitter=args.jitter, error_rate=args.error_rate)
+    profiles = {
+        name: FaultProfile(**vars(profile)) for name in ("github", "deepseek", "deepgram", "outline")
+    }
+    profiles["github"].rate_limit = args.github_rate_limit
+    profiles["deepseek"].rate_limit = args.deepseek_rate_limit
+    services = await start_fakes(profiles, seed=args.seed)
+
+    # Endpoints are read when the bot modules are imported, so point them at the fakes first
+    os.environ.update({
+        "GITHUB_API_URL": services.urls["github"],
+        "GITHUB_WEB_URL": services.urls["github"],
+        "DEEPSEEK_API_URL": services.urls["deepseek"],
+        "DEEPGRAM_API_URL": services.urls["deepgram"],
+        "OUTLINE_API_URL": services.urls["outline"],
+        "DEEPSEEK_API_KEY": "loadtest",
+        "OUTLINE_API_KEY": "loadtest",
+    })
+    if args.graphql:
+        os.environ.update({"GITHUB_GRAPHQL": "1", "GITHUB_PAT": "loadtest"})
+    from bot.core.jobs import get_scheduler
+    from bot.core.llm import close_llm_gateway, get_llm_gateway
+    from bot.core.metrics import LoopLagMonitor, metrics
+
+    pr_module = importlib.import_module("bot.features.auto_pr_review.cog")
+    qa_module = importlib.import_module("bot.features.smart_qa.cog")
+    # keep the real tracked_repos.json untouched
+    pr_module.STORAGE_PATH = os.path.join(tempfile.mkdtemp(prefix="utilitybot-loadtest-"), "tracked_repos.json")
+
+    bot = FakeBot()
+    pr_cog = pr_module.AutoPRReviewCog(bot)
+    pr_cog.poll_atom_feeds.cancel()  # the driver runs the feed loop on its own schedule
+    qa_cog = qa_module.SmartQACog(bot)
+    pr_cog.tracked_feeds = {
+        f"Electrium-Mobility/loadtest-{i}": {
+            "atom_url": f"{services.urls['github']}/Electrium-Mobility/loadtest-{i}/commits.atom",
+            "last_id": commit_entry_id(0),
+            "channel_id": bot.channel.id,
+        }
+        for i in range(args.feeds)
+    }
+
+    operations = {
+        "prreview": lambda ctx, rng: pr_cog.prreview.callback(
+            pr_cog, ctx, pr_link=f"https://github.com/Electrium-Mobility/loadtest-{rng.randrange(5)}/pull/{rng.randrange(1, 500)}"
+        ),
+        "qa": lambda ctx, rng: qa_cog.qa.callback(qa_cog, ctx, question="How are features loaded?"),
+        "docs": lambda ctx, rng: qa_cog.get_bottom_docs.callback(qa_cog, ctx),
+    }
+    mix = _parse_mix(args.mix)
+    unknown = set(mix) - set(operations)
+    if unknown:
+        raise SystemExit(f"Unknown operations in --mix: {', '.join(sorted(unknown))}")
+    names, weights = list(mix), list(mix.values())
+
+    latencies: Dict[str, List[float]] = defaultdict(list)
+    errors: Dict[str, int] = defaultdict(int)
+    deadline = time.monotonic() + args.duration
+
+    async def timed(name, coro_factory):
+        start = time.perf_counter()
+        try:
+            await coro_factory()
+        except Exception:
+            errors[name] += 1
+        latencies[name].append(time.perf_counter() - start)
+
+    async def user(user_id: int):
+        rng = random.Random(args.seed * 1000 + user_id)
+        ctx = FakeContext(bot, user_id)
+        while time.monotonic() < deadline:
+            name = rng.choices(names, weights)[0]
+            await timed(name, lambda: operations[name](ctx, rng))
+            if args.think_time:
+                await asyncio.sleep(rng.expovariate(1 / args.think_time))
+
+    async def feeds():
+        while time.monotonic() < deadline:
+            await timed("feed", pr_cog.poll_atom_feeds)
+            await asyncio.sleep(args.feed_interval)
+
+    # feed commit reviews run as jobs; no state path so nothing is persisted
+    await get_scheduler().start()
+    lag_monitor = LoopLagMonitor(threshold=args.lag_threshold)
+    lag_monitor.start()
+    started = time.perf_counter()
+    try:
+        await asyncio.gather(feeds(), *(user(i) for i in range(args.users)))
+    finally:
+        elapsed = time.perf_counter() - started
+        lag_monitor.stop()
+        await get_scheduler().stop()
+        await pr_cog.cog_unload()
+        await close_llm_gateway()
+        await services.close()
+
+    total = sum(len(v) for v in latencies.values())
+    print(f"\n{args.users} users, {args.duration:.0f}s, {total} operations, {total / elapsed:.1f} ops/s")
+    print(f"{'operation':<10} {'count':>7} {'errors':>7} {'p50':>9} {'p99':>9} {'max':>9}")
+    for name in sorted(latencies):
+        values = latencies[name]
+        print(
+            f"{name:<10} {len(values):>7} {errors[name]:>7} "
+            f"{_percentile(values, 0.5) * 1000:>7.0f}ms {_percentile(values, 0.99) * 1000:>7.0f}ms "
+            f"{max(values) * 1000:>7.0f}ms"
+        )
+
+    lag = metrics.loop_lag
+    print(
+        f"\nevent loop lag: p50 {lag.quantile(0.5) * 1000:.0f}ms, p99 {lag.quantile(0.99) * 1000:.0f}ms, "
+        f"max {lag.max * 1000:.0f}ms, stalls over {args.lag_threshold * 1000:.0f}ms: {metrics.stalls}"
+    )
+    print("fake services:")
+    for name, stats in services.stats.items():
+        print(f"  {name:<9} {stats.requests:>6} requests, {stats.errors} injected errors, {stats.rate_limited} rate limited")
+    for feature, s in sorted(get_llm_gateway().stats().items()):
+        print(
+            f"  llm/{feature}: {s.requests} calls, {s.failures} failed, {s.retries} retries, "
+            f"avg {s.avg_latency * 1000:.0f}ms"
+        )
+    print(f"messages sent: {bot.channel.sent}")
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=10, help="concurrent simulated users")
+    parser.add_argument("--duration", type=float, default=20.0, help="seconds to run")
+    parser.add_argument("--mix", default="prreview=3,qa=3,docs=1", help="weighted operation mix")
+    parser.add_argument("--think-time", type=float, default=0.5, help="mean pause between a user's commands")
+    parser.add_argument("--feeds", type=int, default=5, help="tracked repos polled by the feed loop")
+    parser.add_argument("--feed-interval", type=float, default=2.0, help="seconds between feed polls")
+    parser.add_argument("--latency", type=float, default=0.05, help="mean fake service latency in seconds")
+    parser.add_argument("--jitter", type=float, default=0.02, help="latency standard deviation in seconds")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of fake responses that are 503")
+    parser.add_argument("--github-rate-limit", type=int, default=0, help="GitHub requests per minute, 0 = unlimited")
+    parser.add_argument("--deepseek-rate-limit", type=int, default=0, help="DeepSeek requests per minute, 0 = unlimited")
+    parser.add_argument("--graphql", action="store_true", help="use the GitHub GraphQL client mode")
+    parser.add_argument("--lag-threshold", type=float, default=0.1, help="event loop stall threshold in seconds")
+    parser.add_argument("--seed", type=int, default=0)
+    asyncio.run(run(parser.parse_args(argv)))
+
+
+if __name__ == "__main__":
+    main()
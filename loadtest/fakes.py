@@ -0,0 +1,294 @@
+"""Local aiohttp stand-ins for GitHub, DeepSeek, Deepgram and Outline.
+
+Every fake runs behind a middleware that injects latency, random 5xx
+errors and GitHub-style ``X-RateLimit-*`` headers with 429 responses once
+the per-window budget is spent.
+"""
+import asyncio
+import math
+import random
+import time
+from dataclasses import dataclass, field
+from typing import Dict
+
+from aiohttp import web
+
+from benchmarks import fixtures
+
+FEED_LENGTH = 20
+PR_FILES = 12  # changed files listed for every fake PR
+
+
+@dataclass
+class FaultProfile:
+    """Behaviour knobs for one fake service."""
+    latency: float = 0.05  # mean seconds added to every response
+    jitter: float = 0.02  # standard deviation of the added latency
+    error_rate: float = 0.0  # fraction of requests answered with 503
+    rate_limit: int = 0  # requests allowed per window, 0 disables limiting
+    window: float = 60.0
+
+
+@dataclass
+class ServiceStats:
+    requests: int = 0
+    errors: int = 0
+    rate_limited: int = 0
+
+
+@dataclass
+class FakeServices:
+    """Running fakes, keyed by service name."""
+    urls: Dict[str, str] = field(default_factory=dict)
+    stats: Dict[str, ServiceStats] = field(default_factory=dict)
+    runners: list = field(default_factory=list)
+
+    async def close(self) -> None:
+        for runner in self.runners:
+            await runner.cleanup()
+
+
+def commit_sha(n: int) -> str:
+    return f"{n:040x}"
+
+
+def commit_entry_id(n: int) -> str:
+    return f"tag:github.com,2008:Grit::Commit/{commit_sha(n)}"
+
+
+def _fault_middleware(profile: FaultProfile, stats: ServiceStats, rng: random.Random):
+    window = {"start": time.monotonic(), "used": 0}
+
+    @web.middleware
+    async def middleware(request, handler):
+        now = time.monotonic()
+        if now - window["start"] >= profile.window:
+            window["start"], window["used"] = now, 0
+        window["used"] += 1
+        stats.requests += 1
+
+        headers = {}
+        reset_in = profile.window - (now - window["start"])
+        if profile.rate_limit:
+            headers = {
+                "X-RateLimit-Limit": str(profile.rate_limit),
+                "X-RateLimit-Remaining": str(max(0, profile.rate_limit - window["used"])),
+                "X-RateLimit-Reset": str(int(time.time() + reset_in)),
+            }
+
+        await asyncio.sleep(max(0.0, rng.gauss(profile.latency, profile.jitter)))
+
+        if profile.rate_limit and window["used"] > profile.rate_limit:
+            stats.rate_limited += 1
+            headers["Retry-After"] = str(math.ceil(reset_in))
+            return web.json_response({"message": "API rate limit exceeded"}, status=429, headers=headers)
+        if rng.random() < profile.error_rate:
+            stats.errors += 1
+            return web.json_response({"message": "injected failure"}, status=503, headers=headers)
+
+        response = await handler(request)
+        response.headers.update(headers)
+        return response
+
+    return middleware
+
+
+def _wants_diff(request) -> bool:
+    return "diff" in request.headers.get("Accept", "")
+
+
+def github_app(web_url_holder: dict) -> web.Application:
+    feed_heads: Dict[str, int] = {}
+
+    async def pull(request):
+        number = int(request.match_info["number"])
+        if _wants_diff(request):
+            return web.Response(text=await pull_diff(number), content_type="text/plain")
+        owner, repo = request.match_info["owner"], request.match_info["repo"]
+        return web.json_response({
+            "number": number,
+            "title": f"Load test PR {number}",
+            "user": {"login": "loadtester"},
+            "additions": 480,
+            "deletions": 240,
+            "merged": False,
+            "mergeable_state": "clean",
+            "html_url": f"{web_url_holder['url']}/{owner}/{repo}/pull/{number}",
+        })
+
+    def pr_files(number):
+        rng = random.Random(number)
+        files = []
+        for i in range(PR_FILES):
+            lines = rng.randrange(5, 80)
+            patch = fixtures.unified_diff(1, lines, seed=number * 100 + i).split("\n", 3)[3]
+            name = f"src/module_{i}/file_{i}{rng.choice(['.py', '.py', '.ts', '.md', '.json'])}"
+            files.append({
+                "filename": name,
+                "status": "modified",
+                "additions": lines // 2,
+                "deletions": lines - lines // 2,
+                "changes": lines,
+                "patch": patch,
+            })
+        return files
+
+    async def pull_files(request):
+        per_page = int(request.query.get("per_page", 30))
+        page = int(request.query.get("page", 1))
+        files = pr_files(int(request.match_info["number"]))
+        return web.json_response(files[(page - 1) * per_page:page * per_page])
+
+    async def pull_diff(number):
+        # the same files pull_files lists, as one diff
+        return "\n".join(
+            f"diff --git a/{f['filename']} b/{f['filename']}\n--- a/{f['filename']}\n+++ b/{f['filename']}\n{f['patch']}"
+            for f in pr_files(number)
+        )
+
+    async def commit(request):
+        sha = request.match_info["sha"]
+        if _wants_diff(request):
+            return web.Response(text=fixtures.unified_diff(3, 40, seed=int(sha, 16) % 10_000), content_type="text/plain")
+        return web.json_response({"sha": sha, "stats": {"additions": 80, "deletions": 40}})
+
+    def advance_head(repo):
+        # every poll sees exactly one new commit at the head of the feed
+        head = feed_heads[repo] = feed_heads.get(repo, 0) + 1
+        return head
+
+    async def graphql(request):
+        # answers the two query shapes the bot sends, told apart by their variables
+        variables = (await request.json()).get("variables", {})
+        owner = variables["owner"]
+        data = {"rateLimit": {"cost": 1, "remaining": 4999, "resetAt": "2030-01-01T00:00:00Z"}}
+        if "number" in variables:
+            number = variables["number"]
+            files = pr_files(number)
+            data["repository"] = {"pullRequest": {
+                "number": number,
+                "title": f"Load test PR {number}",
+                "url": f"{web_url_holder['url']}/{owner}/{variables['name']}/pull/{number}",
+                "additions": sum(f["additions"] for f in files),
+                "deletions": sum(f["deletions"] for f in files),
+                "merged": False,
+                "isDraft": False,
+                "mergeStateStatus": "CLEAN",
+                "author": {"login": "loadtester"},
+                "files": {
+                    "nodes": [{"path": f["filename"], "additions": f["additions"], "deletions": f["deletions"]} for f in files],
+                    "pageInfo": {"hasNextPage": False, "endCursor": None},
+                },
+            }}
+            return web.json_response({"data": data})
+        i = 0
+        while f"name{i}" in variables:
+            repo = variables[f"name{i}"]
+            head = advance_head(repo)
+            nodes = [
+                {
+                    "oid": commit_sha(n),
+                    "messageHeadline": f"Commit {n} on {repo}",
+                    "url": f"{web_url_holder['url']}/{owner}/{repo}/commit/{commit_sha(n)}",
+                    "committedDate": "2025-01-01T12:00:00Z",
+                    "author": {"name": "loadtester"},
+                }
+                for n in range(head, max(0, head - variables["first"]), -1)
+            ]
+            data[f"r{i}"] = {"defaultBranchRef": {"target": {"history": {"nodes": nodes}}}}
+            i += 1
+        return web.json_response({"data": data})
+
+    async def atom(request):
+        owner, repo = request.match_info["owner"], request.match_info["repo"]
+        head = advance_head(repo)
+        entries = []
+        for n in range(head, max(0, head - FEED_LENGTH), -1):
+            entries.append(
+                "<entry>"
+                f"<id>{commit_entry_id(n)}</id>"
+                f'<link type="text/html" rel="alternate" href="{web_url_holder["url"]}/{owner}/{repo}/commit/{commit_sha(n)}"/>'
+                f"<title>Commit {n} on {repo}</title>"
+                "<updated>2025-01-01T12:00:00Z</updated>"
+                "<author><name>loadtester</name></author>"
+                "</entry>"
+            )
+        xml_text = '<?xml version="1.0" encoding="UTF-8"?><feed xmlns="http://www.w3.org/2005/Atom">' + "".join(entries) + "</feed>"
+        return web.Response(text=xml_text, content_type="application/atom+xml")
+
+    app = web.Application()
+    app.router.add_get("/repos/{owner}/{repo}/pulls/{number}", pull)
+    app.router.add_get("/repos/{owner}/{repo}/pulls/{number}/files", pull_files)
+    app.router.add_get("/repos/{owner}/{repo}/commits/{sha}", commit)
+    app.router.add_get("/{owner}/{repo}/commits.atom", atom)
+    app.router.add_post("/graphql", graphql)
+    return app
+
+
+def deepseek_app() -> web.Application:
+    async def completions(request):
+        body = await request.json()
+        prompt_chars = sum(len(m.get("content", "")) for m in body.get("messages", []))
+        completion = "**Summary**\n- Load test response\n\n**Potential Issues**\n- None found"
+        return web.json_response({
+            "choices": [{"message": {"role": "assistant", "content": completion}}],
+            "usage": {"prompt_tokens": prompt_chars // 4, "completion_tokens": len(completion) // 4},
+        })
+
+    app = web.Application()
+    app.router.add_post("/v1/chat/completions", completions)
+    return app
+
+
+def deepgram_app() -> web.Application:
+    async def listen(request):
+        await request.read()
+        transcript = "Alice will order the new battery cells. Bob owns the firmware update."
+        return web.json_response({"results": {"channels": [{"alternatives": [{"transcript": transcript}]}]}})
+
+    app = web.Application()
+    app.router.add_post("/v1/listen", listen)
+    return app
+
+
+def outline_app() -> web.Application:
+    async def collections(request):
+        return web.json_response({"data": [{"id": "col-1", "name": "Engineering"}, {"id": "col-2", "name": "Operations"}]})
+
+    async def documents(request):
+        return web.json_response({"data": fixtures.document_tree(200, depth=8)})
+
+    app = web.Application()
+    app.router.add_post("/collections.list", collections)
+    app.router.add_post("/documents.list", documents)
+    return app
+
+
+async def _serve(app: web.Application, profile: FaultProfile, stats: ServiceStats, seed: int):
+    app.middlewares.append(_fault_middleware(profile, stats, random.Random(seed)))
+    runner = web.AppRunner(app, access_log=None)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    host, port = runner.addresses[0][:2]
+    return runner, f"http://{host}:{port}"
+
+
+async def start_fakes(profiles: Dict[str, FaultProfile], seed: int = 0) -> FakeServices:
+    """Start all fakes on ephemeral local ports. ``profiles`` is keyed by service name."""
+    services = FakeServices()
+    github_web = {"url": ""}
+    apps = {
+        "github": github_app(github_web),
+        "deepseek": deepseek_app(),
+        "deepgram": deepgram_app(),
+        "outline": outline_app(),
+    }
+    for i, (name, app) in enumerate(apps.items()):
+        stats = services.stats[name] = ServiceStats()
+        runner, url = await _serve(app, profiles.get(name, FaultProfile()), stats, seed + i)
+        services.runners.append(runner)
+        services.urls[name] = url
+    # one fake serves both api.github.com and github.com paths
+    github_web["url"] = services.urls["github"]
+    return services